@@ -10,6 +10,7 @@ import sys
 import argparse
 from typing import Optional
 
+from scripts.batch_runner import BATCH_MODES, BatchRunner, print_summary
 from scripts.bedrock_client import BedrockClient
 from scripts.config import config
 
@@ -77,6 +78,29 @@ def single_query_mode(client: BedrockClient, query: str) -> None:
     print("\n")
 
 
+def batch_mode(client: BedrockClient, args: argparse.Namespace) -> None:
+    """
+    Run a question set concurrently and write answers to JSONL.
+    
+    Args:
+        client: Initialized BedrockClient instance.
+        args: Parsed command-line arguments.
+    """
+    runner = BatchRunner(
+        client,
+        mode=args.mode,
+        concurrency=args.concurrency,
+        max_results=args.max_results
+    )
+    print(f"Running {args.batch} ({args.mode}, concurrency {args.concurrency}) -> {args.out}")
+    summary = runner.run(args.batch, args.out)
+    print_summary(summary)
+    
+    if summary['errors']:
+        print(f"\n⚠️  {summary['errors']} item(s) failed; rerun the same command to retry them.")
+        sys.exit(1)
+
+
 def main() -> None:
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -92,6 +116,9 @@ Examples:
   
   # Specify custom agent
   python cli.py --agent-id AGENT_ID --alias-id ALIAS_ID "Your question"
+  
+  # Batch mode (resumable: rerun to continue after a crash)
+  python cli.py --batch questions.jsonl --out answers.jsonl --concurrency 16
         """
     )
     
@@ -116,13 +143,42 @@ Examples:
         '--region',
         help='AWS region (overrides config)'
     )
+    parser.add_argument(
+        '--batch',
+        metavar='QUESTIONS_JSONL',
+        help='Run a question set (one {"id", "question"} per line) concurrently'
+    )
+    parser.add_argument(
+        '--out',
+        default='answers.jsonl',
+        help='Batch output JSONL, also used to resume (default: answers.jsonl)'
+    )
+    parser.add_argument(
+        '--mode',
+        choices=BATCH_MODES,
+        default='agent',
+        help='Batch mode: agent answers or direct KB retrieval (default: agent)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=8,
+        help='Batch queries in flight (default: 8)'
+    )
+    parser.add_argument(
+        '--max-results',
+        type=int,
+        default=5,
+        help='Results per query in retrieve mode (default: 5)'
+    )
     
     args = parser.parse_args()
     
     # Initialize client
     client = BedrockClient(
         profile_name=args.profile,
-        region_name=args.region
+        region_name=args.region,
+        max_connections=max(args.concurrency, 10) if args.batch else None
     )
     
     # Override config if provided
@@ -138,7 +194,9 @@ Examples:
         sys.exit(1)
     
     # Run appropriate mode
-    if args.query:
+    if args.batch:
+        batch_mode(client, args)
+    elif args.query:
         query = ' '.join(args.query)
         single_query_mode(client, query)
     else:
@@ -5,9 +5,11 @@ import boto3
 import os
 from typing import Any
 
+from scripts.federated_retrieval import federated_retrieve
+
 class BedrockAgentMCP:
     def __init__(self):
-        session = boto3.Session(profile_name='CIANDT-Contributor-253223147282')
+        session = boto3.Session(profile_name=os.environ.get('AWS_PROFILE', 'CIANDT-Contributor-253223147282'))
         self.bedrock = session.client('bedrock-agent-runtime', region_name='us-east-1')
         self.agent_id = None
         self.agent_alias_id = None
@@ -34,10 +36,16 @@ class BedrockAgentMCP:
         
         return result
     
-    def retrieve_kb(self, query: str, kb_id: str) -> list:
+    def retrieve_kb(self, query: str, kb_id: str, max_results: int = None) -> list:
+        kwargs = {}
+        if max_results:
+            kwargs['retrievalConfiguration'] = {
+                'vectorSearchConfiguration': {'numberOfResults': max_results}
+            }
         response = self.bedrock.retrieve(
             knowledgeBaseId=kb_id,
-            retrievalQuery={'text': query}
+            retrievalQuery={'text': query},
+            **kwargs
         )
         
         results = []
@@ -47,6 +55,11 @@ class BedrockAgentMCP:
                 'score': item.get('score', 0)
             })
         return results
+    
+    def federated_retrieve(self, query: str, kb_ids: list, max_results: int = 5,
+                           timeout: float = 10.0, fusion: str = 'minmax') -> dict:
+        return federated_retrieve(self.retrieve_kb, query, kb_ids,
+                                  max_results=max_results, timeout=timeout, method=fusion)
 
 def handle_request(request: dict) -> dict:
     method = request.get('method')
@@ -82,6 +95,21 @@ def handle_request(request: dict) -> dict:
                         },
                         'required': ['kb_id', 'query']
                     }
+                },
+                {
+                    'name': 'federated_retrieve',
+                    'description': 'Retrieve from several Knowledge Bases concurrently and merge the results',
+                    'inputSchema': {
+                        'type': 'object',
+                        'properties': {
+                            'kb_ids': {'type': 'array', 'items': {'type': 'string'}},
+                            'query': {'type': 'string'},
+                            'max_results': {'type': 'integer', 'default': 5},
+                            'timeout': {'type': 'number', 'default': 10},
+                            'fusion': {'type': 'string', 'enum': ['minmax', 'rrf'], 'default': 'minmax'}
+                        },
+                        'required': ['kb_ids', 'query']
+                    }
                 }
             ]
         }
@@ -98,6 +126,15 @@ def handle_request(request: dict) -> dict:
         elif tool_name == 'retrieve_from_kb':
             results = mcp.retrieve_kb(args['query'], args['kb_id'])
             return {'content': [{'type': 'text', 'text': json.dumps(results, indent=2)}]}
+        
+        elif tool_name == 'federated_retrieve':
+            results = mcp.federated_retrieve(
+                args['query'], args['kb_ids'],
+                max_results=args.get('max_results', 5),
+                timeout=args.get('timeout', 10),
+                fusion=args.get('fusion', 'minmax')
+            )
+            return {'content': [{'type': 'text', 'text': json.dumps(results, indent=2)}]}
     
     return {'error': 'Unknown method'}
 
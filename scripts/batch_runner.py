@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Concurrent Batch Runner
+
+This module runs a question set through the Bedrock Agent (or direct
+Knowledge Base retrieval) concurrently. Results are appended to a JSONL
+file as they finish; the same file acts as the checkpoint, so a crashed
+run resumes without redoing completed items. When a run finishes, the
+file is compacted to one record (the latest) per id.
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Set
+
+from .bedrock_client import BedrockClient
+
+
+BATCH_MODES = ('agent', 'retrieve')
+
+
+def read_questions(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read a question set.
+
+    Each line is a JSON object with ``question`` (or ``query``) and an
+    optional ``id``; items without an id are numbered by line.
+
+    Args:
+        path: Questions JSONL path.
+
+    Yields:
+        Dicts with ``id`` and ``question`` (other fields are kept).
+    """
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            item.setdefault('id', str(line_number))
+            item['id'] = str(item['id'])
+            item['question'] = item.get('question') or item['query']
+            yield item
+
+
+def completed_ids(path: str) -> Set[str]:
+    """
+    Collect ids that already succeeded in a previous run.
+
+    A partially written last line (from a crash) is ignored.
+
+    Args:
+        path: Answers JSONL path.
+
+    Returns:
+        Set of item ids with status ``ok``.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('status') == 'ok':
+                done.add(record['id'])
+    return done
+
+
+def compact_results(path: str) -> int:
+    """
+    Rewrite an answers file with only the latest record per id.
+
+    Retried items leave their earlier error records behind; compaction
+    drops those and any half-written lines. Records keep the order in
+    which their ids first appeared. The file is replaced atomically.
+
+    Args:
+        path: Answers JSONL path.
+
+    Returns:
+        Number of lines dropped.
+    """
+    latest: Dict[str, str] = {}
+    total = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            total += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            latest[record['id']] = line if line.endswith('\n') else line + '\n'
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        out.writelines(latest.values())
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_path, path)
+    return total - len(latest)
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class BatchRunner:
+    """Runs agent or retrieval queries concurrently with resumable output."""
+
+    def __init__(
+        self,
+        client: BedrockClient,
+        mode: str = 'agent',
+        concurrency: int = 8,
+        max_results: int = 5
+    ) -> None:
+        """
+        Initialize batch runner.
+
+        Args:
+            client: Initialized BedrockClient instance.
+            mode: 'agent' (invoke_agent) or 'retrieve' (retrieve_from_kb).
+            concurrency: Number of queries in flight.
+            max_results: Results per query in retrieve mode.
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode '{mode}', expected one of {BATCH_MODES}")
+
+        self.client = client
+        self.mode = mode
+        self.concurrency = concurrency
+        self.max_results = max_results
+        # One prefix per run keeps sessions isolated from earlier runs
+        self.run_id = uuid.uuid4().hex[:8]
+
+    def _run_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single item and return its output record."""
+        record = {'id': item['id'], 'question': item['question'], 'mode': self.mode}
+        start = time.perf_counter()
+
+        try:
+            if self.mode == 'agent':
+                session_id = f"batch-{self.run_id}-{item['id']}"
+                record['session_id'] = session_id
+                record['answer'] = self.client.invoke_agent(item['question'], session_id=session_id)
+            else:
+                record['results'] = self.client.retrieve_from_kb(
+                    item['question'], max_results=self.max_results
+                )
+            record['status'] = 'ok'
+        except Exception as e:
+            record['status'] = 'error'
+            record['error'] = str(e)
+
+        record['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return record
+
+    def run(self, questions_path: str, output_path: str) -> Dict[str, Any]:
+        """
+        Run all pending questions and append results as they finish.
+
+        Args:
+            questions_path: Questions JSONL path.
+            output_path: Answers JSONL path (also the checkpoint).
+
+        Returns:
+            Summary with counts, throughput and latency percentiles.
+        """
+        done = completed_ids(output_path)
+        pending = (item for item in read_questions(questions_path) if item['id'] not in done)
+
+        lock = threading.Lock()
+        latencies: List[float] = []
+        counts = {'ok': 0, 'error': 0}
+        start = time.perf_counter()
+
+        with open(output_path, 'a', encoding='utf-8') as out, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+
+            def record_result(record: Dict[str, Any]) -> None:
+                with lock:
+                    out.write(json.dumps(record, default=str) + '\n')
+                    out.flush()
+                    os.fsync(out.fileno())
+                    counts[record['status']] += 1
+                    latencies.append(record['latency_ms'])
+                    finished = counts['ok'] + counts['error']
+                    print(f"\r[{finished}] ok={counts['ok']} errors={counts['error']}",
+                          end='', flush=True)
+
+            # Terminate a line left half-written by a crash
+            if out.tell() and not _ends_with_newline(output_path):
+                out.write('\n')
+
+            in_flight = set()
+            for item in pending:
+                in_flight.add(executor.submit(self._run_item, item))
+                if len(in_flight) >= self.concurrency * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record_result(future.result())
+
+            for future in in_flight:
+                record_result(future.result())
+
+        print()
+        compact_results(output_path)
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        processed = counts['ok'] + counts['error']
+
+        return {
+            'skipped': len(done),
+            'processed': processed,
+            'ok': counts['ok'],
+            'errors': counts['error'],
+            'elapsed_seconds': round(elapsed, 1),
+            'throughput_per_second': round(processed / elapsed, 2) if elapsed else 0.0,
+            'latency_ms': {
+                'mean': round(statistics.mean(latencies), 1) if latencies else 0.0,
+                'p50': percentile(latencies, 0.50),
+                'p95': percentile(latencies, 0.95),
+                'p99': percentile(latencies, 0.99),
+                'max': latencies[-1] if latencies else 0.0
+            }
+        }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """
+    Print a batch run summary.
+
+    Args:
+        summary: Result of ``BatchRunner.run``.
+    """
+    latency = summary['latency_ms']
+    print("=" * 70)
+    print("Batch Summary")
+    print("=" * 70)
+    print(f"Resumed (already done): {summary['skipped']}")
+    print(f"Processed:              {summary['processed']} "
+          f"(ok={summary['ok']}, errors={summary['errors']})")
+    print(f"Elapsed:                {summary['elapsed_seconds']}s")
+    print(f"Throughput:             {summary['throughput_per_second']} queries/s")
+    print(f"Latency (ms):           mean {latency['mean']} | p50 {latency['p50']} | "
+          f"p95 {latency['p95']} | p99 {latency['p99']} | max {latency['max']}")
@@ -9,8 +9,10 @@ AWS Bedrock Agents and Knowledge Bases.
 from typing import Dict, List, Any, Optional, Iterator
 
 import boto3
+from botocore.config import Config
 
 from .config import config
+from .federated_retrieval import federated_retrieve
 
 
 class BedrockClient:
@@ -19,7 +21,8 @@ class BedrockClient:
     def __init__(
         self,
         profile_name: Optional[str] = None,
-        region_name: Optional[str] = None
+        region_name: Optional[str] = None,
+        max_connections: Optional[int] = None
     ) -> None:
         """
         Initialize Bedrock client.
@@ -27,6 +30,8 @@ class BedrockClient:
         Args:
             profile_name: AWS profile name.
             region_name: AWS region name.
+            max_connections: HTTP connection pool size; raise it when the
+                client is shared by more than 10 threads.
         """
         self.profile_name = profile_name or config.AWS_PROFILE
         self.region_name = region_name or config.AWS_REGION
@@ -36,8 +41,9 @@ class BedrockClient:
             region_name=self.region_name
         )
         
-        self.agent_runtime = session.client('bedrock-agent-runtime')
-        self.agent_client = session.client('bedrock-agent')
+        client_config = Config(max_pool_connections=max_connections) if max_connections else None
+        self.agent_runtime = session.client('bedrock-agent-runtime', config=client_config)
+        self.agent_client = session.client('bedrock-agent', config=client_config)
     
     def invoke_agent(
         self,
@@ -144,6 +150,33 @@ class BedrockClient:
         
         return response['retrievalResults']
     
+    def federated_retrieve(
+        self,
+        query: str,
+        kb_ids: List[str],
+        max_results: int = 5,
+        timeout: float = 10.0,
+        fusion: str = 'minmax'
+    ) -> Dict[str, Any]:
+        """
+        Retrieve from several Knowledge Bases concurrently and merge results.
+        
+        Args:
+            query: Search query text.
+            kb_ids: Knowledge Base IDs to query.
+            max_results: Maximum number of merged results to return.
+            timeout: Seconds to wait for each Knowledge Base.
+            fusion: Score fusion method ('minmax' or 'rrf').
+            
+        Returns:
+            Dict with merged ``results``, per-KB ``knowledge_bases`` status
+            and a ``partial`` flag set when a Knowledge Base timed out or failed.
+        """
+        return federated_retrieve(
+            self.retrieve_from_kb, query, kb_ids,
+            max_results=max_results, timeout=timeout, method=fusion
+        )
+    
     def start_ingestion_job(
         self,
         kb_id: Optional[str] = None,
@@ -196,6 +229,25 @@ class BedrockClient:
         )
         
         return response['ingestionJob']
+    
+    def list_data_sources(self, kb_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List data sources attached to a Knowledge Base.
+        
+        Args:
+            kb_id: Knowledge Base ID (uses config if not provided).
+            
+        Returns:
+            List of data source summaries.
+        """
+        kb_id = kb_id or config.KNOWLEDGE_BASE_ID
+        
+        summaries = []
+        paginator = self.agent_client.get_paginator('list_data_sources')
+        for page in paginator.paginate(knowledgeBaseId=kb_id):
+            summaries.extend(page['dataSourceSummaries'])
+        
+        return summaries
 
 
 def main() -> None:
@@ -205,7 +257,7 @@ def main() -> None:
     client = BedrockClient()
     
     if len(sys.argv) < 2:
-        print("Usage: python bedrock_client.py [agent|retrieve] <query>")
+        print("Usage: python bedrock_client.py [agent|retrieve|federated] <query>")
         sys.exit(1)
     
     command = sys.argv[1]
@@ -222,6 +274,16 @@ def main() -> None:
         for i, result in enumerate(results, 1):
             print(f"\n{i}. Score: {result['score']:.4f}")
             print(f"   Text: {result['content']['text'][:200]}...")
+    elif command == "federated":
+        import os
+        kb_ids = os.environ.get('KB_IDS', config.KNOWLEDGE_BASE_ID).split(',')
+        print(f"Retrieving from {len(kb_ids)} KBs...")
+        response = client.federated_retrieve(query, kb_ids, max_results=3)
+        for kb_id, status in response['knowledge_bases'].items():
+            print(f"  {kb_id}: {status['status']} ({status['latency_ms']} ms)")
+        for i, result in enumerate(response['results'], 1):
+            print(f"\n{i}. Score: {result['fusedScore']:.4f} [{result['knowledgeBaseId']}]")
+            print(f"   Text: {result['content']['text'][:200]}...")
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Embedding Dimension Evaluation
+
+This module compares embedding configurations (dimension and float/binary
+type) on a locally exported sample of the corpus. It reports recall@k
+against a reference configuration, estimated HNSW index memory and
+exact-scan query latency, so a low-dimension mode can be chosen before
+re-indexing the Knowledge Base.
+
+Workflow:
+    1. export   - pull a sample of text chunks from the OpenSearch index
+    2. embed    - embed the sample with Titan for each configuration
+    3. evaluate - compare configurations offline
+"""
+
+import argparse
+import heapq
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import boto3
+
+from .config import config
+from .opensearch_manager import EMBEDDING_DATA_TYPES, SUPPORTED_DIMENSIONS, estimate_vector_memory
+
+
+TITAN_V1_MODEL_ID = "amazon.titan-embed-text-v1"
+TITAN_V2_MODEL_ID = "amazon.titan-embed-text-v2:0"
+
+
+def parse_config_name(name: str) -> Tuple[int, str]:
+    """
+    Parse an embedding configuration name such as ``512:binary``.
+
+    Args:
+        name: Configuration name in ``<dimension>:<type>`` form.
+
+    Returns:
+        Tuple of (dimension, data_type).
+
+    Raises:
+        ValueError: If the configuration is not supported.
+    """
+    dimension, _, data_type = name.partition(':')
+    dimension, data_type = int(dimension), data_type or 'float'
+
+    if dimension not in SUPPORTED_DIMENSIONS or data_type not in EMBEDDING_DATA_TYPES:
+        raise ValueError(f"Unsupported embedding configuration: {name}")
+    if dimension == 1536 and data_type == 'binary':
+        raise ValueError("Titan v1 (1536) does not produce binary embeddings")
+    return dimension, data_type
+
+
+def read_jsonl(path: str) -> List[Dict[str, Any]]:
+    """Read a JSONL file into a list of dicts."""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_jsonl(path: str, records: Iterable[Dict[str, Any]]) -> None:
+    """Write dicts to a JSONL file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+# ---------------------------------------------------------------------------
+# Export and embed
+# ---------------------------------------------------------------------------
+
+def export_sample(
+    output_path: str,
+    size: int = 2000,
+    index_name: str = "bedrock-knowledge-base-index"
+) -> int:
+    """
+    Export text chunks from the vector index to a local JSONL file.
+
+    Args:
+        output_path: Destination JSONL path.
+        size: Number of chunks to export.
+        index_name: OpenSearch index name.
+
+    Returns:
+        Number of exported chunks.
+    """
+    from .opensearch_manager import OpenSearchManager
+
+    manager = OpenSearchManager()
+    response = manager.client.search(
+        index=index_name,
+        body={
+            'size': size,
+            '_source': ['AMAZON_BEDROCK_TEXT_CHUNK'],
+            'query': {'match_all': {}}
+        }
+    )
+
+    records = [
+        {'id': hit['_id'], 'text': hit['_source']['AMAZON_BEDROCK_TEXT_CHUNK']}
+        for hit in response['hits']['hits']
+    ]
+    write_jsonl(output_path, records)
+    return len(records)
+
+
+class TitanEmbedder:
+    """Titan embedding client supporting v1 and v2 output configurations."""
+
+    def __init__(
+        self,
+        profile_name: Optional[str] = None,
+        region_name: Optional[str] = None
+    ) -> None:
+        """
+        Initialize Titan embedder.
+
+        Args:
+            profile_name: AWS profile name.
+            region_name: AWS region name.
+        """
+        session = boto3.Session(
+            profile_name=profile_name or config.AWS_PROFILE,
+            region_name=region_name or config.AWS_REGION
+        )
+        self.runtime = session.client('bedrock-runtime')
+
+    def embed(self, text: str, dimension: int, data_type: str) -> List[float]:
+        """
+        Embed text with the model matching the configuration.
+
+        Args:
+            text: Input text.
+            dimension: Output dimension (1536 selects Titan v1).
+            data_type: 'float' or 'binary'.
+
+        Returns:
+            Embedding vector (0/1 values for binary).
+        """
+        if dimension == 1536:
+            body = {'inputText': text}
+            model_id = TITAN_V1_MODEL_ID
+        else:
+            body = {
+                'inputText': text,
+                'dimensions': dimension,
+                'normalize': True,
+                'embeddingTypes': [data_type]
+            }
+            model_id = TITAN_V2_MODEL_ID
+
+        response = self.runtime.invoke_model(modelId=model_id, body=json.dumps(body))
+        payload = json.loads(response['body'].read())
+
+        if dimension == 1536:
+            return payload['embedding']
+        return payload['embeddingsByType'][data_type]
+
+
+def embed_sample(
+    texts_path: str,
+    output_path: str,
+    config_names: Sequence[str],
+    queries_path: Optional[str] = None,
+    num_queries: int = 100,
+    seed: int = 7
+) -> None:
+    """
+    Embed documents and queries for each configuration.
+
+    If no query file is given, ``num_queries`` documents are reused as
+    queries (they are excluded from their own results during evaluation).
+
+    Args:
+        texts_path: JSONL with ``id`` and ``text`` per document.
+        output_path: Destination sample JSONL.
+        config_names: Configurations such as ``["1024:float", "256:binary"]``.
+        queries_path: Optional JSONL with ``id`` and ``text`` per query.
+        num_queries: Number of documents to sample as queries.
+        seed: Random seed for query sampling.
+    """
+    configs = [parse_config_name(name) for name in config_names]
+    embedder = TitanEmbedder()
+
+    docs = read_jsonl(texts_path)
+    if queries_path:
+        queries = read_jsonl(queries_path)
+    else:
+        queries = random.Random(seed).sample(docs, min(num_queries, len(docs)))
+
+    records = []
+    for kind, items in (('doc', docs), ('query', queries)):
+        for item in items:
+            records.append({
+                'id': item['id'],
+                'kind': kind,
+                'embeddings': {
+                    f"{dimension}:{data_type}": embedder.embed(item['text'], dimension, data_type)
+                    for dimension, data_type in configs
+                }
+            })
+    write_jsonl(output_path, records)
+
+
+# ---------------------------------------------------------------------------
+# Offline evaluation
+# ---------------------------------------------------------------------------
+
+def _pack_bits(bits: Sequence[int]) -> int:
+    return int(''.join('1' if b else '0' for b in bits), 2)
+
+
+def exact_search(
+    query: Any,
+    docs: List[Tuple[str, Any]],
+    data_type: str,
+    k: int,
+    exclude: Optional[str] = None
+) -> List[str]:
+    """
+    Exact nearest-neighbour scan.
+
+    Float vectors are ranked by L2 distance (the index space type);
+    binary vectors are packed into ints and ranked by Hamming distance.
+
+    Args:
+        query: Query vector (list of floats, or packed int for binary).
+        docs: List of (id, vector) pairs. Float vectors are
+            ``(vector, squared_norm)`` tuples.
+        data_type: 'float' or 'binary'.
+        k: Number of neighbours.
+        exclude: Document id to skip (query taken from the corpus).
+
+    Returns:
+        Ids of the k nearest documents.
+    """
+    if data_type == 'binary':
+        scored = ((bin(query ^ vec).count('1'), doc_id) for doc_id, vec in docs if doc_id != exclude)
+    else:
+        scored = (
+            (norm - 2 * sum(map(float.__mul__, query, vec)), doc_id)
+            for doc_id, (vec, norm) in docs if doc_id != exclude
+        )
+    return [doc_id for _, doc_id in heapq.nsmallest(k, scored)]
+
+
+def evaluate_sample(
+    sample_path: str,
+    k: int = 10,
+    reference: Optional[str] = None,
+    corpus_size: Optional[int] = None,
+    m: int = 16
+) -> List[Dict[str, Any]]:
+    """
+    Compare embedding configurations on an embedded sample.
+
+    Args:
+        sample_path: Sample JSONL produced by ``embed_sample``.
+        k: Number of neighbours for recall@k.
+        reference: Configuration used as ground truth (defaults to the
+            largest float configuration in the sample).
+        corpus_size: Corpus size for memory estimates (defaults to the
+            sample size).
+        m: HNSW ``m`` parameter for memory estimates.
+
+    Returns:
+        One result dict per configuration.
+    """
+    records = read_jsonl(sample_path)
+    config_names = sorted(
+        records[0]['embeddings'],
+        key=lambda name: (parse_config_name(name)[1] != 'float', -parse_config_name(name)[0])
+    )
+    reference = reference or config_names[0]
+
+    doc_records = [r for r in records if r['kind'] == 'doc']
+    query_records = [r for r in records if r['kind'] == 'query']
+    doc_ids: Set[str] = {r['id'] for r in doc_records}
+
+    def prepare(name: str) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, Any]]]:
+        _, data_type = parse_config_name(name)
+        if data_type == 'binary':
+            convert = _pack_bits
+        else:
+            def convert(vec: Sequence[float]) -> Any:
+                vec = [float(x) for x in vec]
+                return vec, sum(x * x for x in vec)
+        docs = [(r['id'], convert(r['embeddings'][name])) for r in doc_records]
+        queries = [(r['id'], convert(r['embeddings'][name])) for r in query_records]
+        if data_type == 'float':
+            queries = [(qid, vec) for qid, (vec, _) in queries]
+        return docs, queries
+
+    def run(name: str) -> Tuple[List[List[str]], List[float]]:
+        _, data_type = parse_config_name(name)
+        docs, queries = prepare(name)
+        results, latencies = [], []
+        for query_id, vec in queries:
+            start = time.perf_counter()
+            results.append(exact_search(
+                vec, docs, data_type, k, exclude=query_id if query_id in doc_ids else None
+            ))
+            latencies.append((time.perf_counter() - start) * 1000)
+        return results, latencies
+
+    truth, _ = run(reference)
+    num_vectors = corpus_size or len(doc_records)
+
+    report = []
+    for name in config_names:
+        dimension, data_type = parse_config_name(name)
+        results, latencies = run(name)
+        recalls = [
+            len(set(found) & set(expected)) / len(expected)
+            for found, expected in zip(results, truth) if expected
+        ]
+        report.append({
+            'config': name,
+            'reference': name == reference,
+            'recall_at_k': statistics.mean(recalls) if recalls else 0.0,
+            'memory_bytes': estimate_vector_memory(num_vectors, dimension, data_type, m),
+            'scan_ms_p50': statistics.median(latencies) if latencies else 0.0,
+            'scan_ms_max': max(latencies) if latencies else 0.0
+        })
+    return report
+
+
+def print_report(report: List[Dict[str, Any]], k: int) -> None:
+    """
+    Print an evaluation table.
+
+    Args:
+        report: Result of ``evaluate_sample``.
+        k: Recall cutoff used.
+    """
+    print("=" * 70)
+    print(f"{'Config':<14}{f'Recall@{k}':>10}{'Index MB':>12}{'Scan p50 ms':>14}{'Scan max ms':>14}")
+    print("=" * 70)
+    for row in report:
+        label = row['config'] + (' *' if row['reference'] else '')
+        print(
+            f"{label:<14}{row['recall_at_k']:>10.3f}"
+            f"{row['memory_bytes'] / 1024 / 1024:>12.1f}"
+            f"{row['scan_ms_p50']:>14.2f}{row['scan_ms_max']:>14.2f}"
+        )
+    print("\n* reference configuration (ground truth)")
+    print("Scan latency is an exact local scan and only comparable between rows.")
+
+
+def main() -> None:
+    """Main function for CLI usage."""
+    parser = argparse.ArgumentParser(description="Evaluate embedding dimensions and types")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Export text chunks from the index')
+    export_parser.add_argument('output', help='Output JSONL (id, text)')
+    export_parser.add_argument('--size', type=int, default=2000)
+    export_parser.add_argument('--index', default='bedrock-knowledge-base-index')
+
+    embed_parser = subparsers.add_parser('embed', help='Embed sample for each configuration')
+    embed_parser.add_argument('texts', help='Input JSONL (id, text)')
+    embed_parser.add_argument('output', help='Output sample JSONL')
+    embed_parser.add_argument('--configs', default='1024:float,512:float,256:float,1024:binary,512:binary',
+                              help='Comma-separated <dimension>:<type> list')
+    embed_parser.add_argument('--queries', help='Optional JSONL (id, text) of queries')
+    embed_parser.add_argument('--num-queries', type=int, default=100)
+
+    eval_parser = subparsers.add_parser('evaluate', help='Compare configurations offline')
+    eval_parser.add_argument('sample', help='Sample JSONL from the embed step')
+    eval_parser.add_argument('--k', type=int, default=10)
+    eval_parser.add_argument('--reference', help='Ground-truth configuration, e.g. 1024:float')
+    eval_parser.add_argument('--corpus-size', type=int, help='Vector count for memory estimates')
+    eval_parser.add_argument('--m', type=int, default=16, help='HNSW m parameter')
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        count = export_sample(args.output, args.size, args.index)
+        print(f"Exported {count} chunks to {args.output}")
+    elif args.command == 'embed':
+        embed_sample(args.texts, args.output, args.configs.split(','),
+                     args.queries, args.num_queries)
+        print(f"Wrote embedded sample to {args.output}")
+    elif args.command == 'evaluate':
+        report = evaluate_sample(args.sample, args.k, args.reference, args.corpus_size, args.m)
+        print_report(report, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Federated Knowledge Base Retrieval
+
+This module queries several Knowledge Bases concurrently, normalizes
+their scores so they are comparable, and merges the results into one
+deduplicated ranking. A slow or failing Knowledge Base only drops its own
+results: total latency is bounded by the timeout, not the sum of calls.
+
+The module has no AWS dependency; callers pass a ``retrieve`` function
+(``BedrockClient.retrieve_from_kb`` or the MCP server's equivalent).
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, List, Sequence
+
+
+FUSION_METHODS = ('minmax', 'rrf')
+
+# Reciprocal rank fusion constant (Cormack et al.)
+RRF_K = 60
+
+
+def result_text(result: Dict[str, Any]) -> str:
+    """
+    Get the text of a retrieval result.
+
+    Accepts both the Bedrock ``retrievalResults`` shape
+    (``{'content': {'text': ...}}``) and the flattened MCP shape
+    (``{'content': '...'}``).
+
+    Args:
+        result: Retrieval result.
+
+    Returns:
+        Result text.
+    """
+    content = result.get('content', '')
+    return content.get('text', '') if isinstance(content, dict) else content
+
+
+def dedup_key(result: Dict[str, Any]) -> str:
+    """
+    Build a key identifying the same chunk across Knowledge Bases.
+
+    Args:
+        result: Retrieval result.
+
+    Returns:
+        Hash of the whitespace-normalized chunk text.
+    """
+    text = ' '.join(result_text(result).split()).lower()
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def normalize_minmax(results: List[Dict[str, Any]]) -> List[float]:
+    """
+    Min-max normalize scores of one Knowledge Base to [0, 1].
+
+    Args:
+        results: Results of a single Knowledge Base.
+
+    Returns:
+        Normalized scores in the same order. If all scores are equal,
+        every result gets 1.0.
+    """
+    scores = [result.get('score', 0.0) for result in results]
+    if not scores:
+        return []
+
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(score - low) / (high - low) for score in scores]
+
+
+def fuse_results(
+    results_by_kb: Dict[str, List[Dict[str, Any]]],
+    method: str = 'minmax',
+    max_results: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-Knowledge-Base results into one deduplicated ranking.
+
+    With ``minmax`` a chunk found in several Knowledge Bases keeps its
+    best normalized score; with ``rrf`` its reciprocal-rank contributions
+    are summed.
+
+    Args:
+        results_by_kb: Results keyed by Knowledge Base ID, each list in
+            the Knowledge Base's own ranking order.
+        method: Fusion method ('minmax' or 'rrf').
+        max_results: Maximum number of merged results to return.
+
+    Returns:
+        Merged results, best first. Each result is a copy annotated with
+        ``knowledgeBaseId``, ``knowledgeBaseIds`` and ``fusedScore``.
+
+    Raises:
+        ValueError: If the fusion method is unknown.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}', expected one of {FUSION_METHODS}")
+
+    merged: Dict[str, Dict[str, Any]] = {}
+
+    for kb_id, results in results_by_kb.items():
+        ranked = sorted(results, key=lambda r: r.get('score', 0.0), reverse=True)
+        if method == 'minmax':
+            scores = normalize_minmax(ranked)
+        else:
+            scores = [1.0 / (RRF_K + rank) for rank in range(1, len(ranked) + 1)]
+
+        for result, score in zip(ranked, scores):
+            key = dedup_key(result)
+            entry = merged.get(key)
+
+            if entry is None:
+                entry = dict(result, knowledgeBaseId=kb_id, knowledgeBaseIds=[kb_id], fusedScore=score)
+                merged[key] = entry
+                continue
+
+            if kb_id not in entry['knowledgeBaseIds']:
+                entry['knowledgeBaseIds'].append(kb_id)
+            if method == 'rrf':
+                entry['fusedScore'] += score
+            elif score > entry['fusedScore']:
+                entry.update(result, knowledgeBaseId=kb_id, fusedScore=score)
+
+    ranking = sorted(merged.values(), key=lambda r: r['fusedScore'], reverse=True)
+    return ranking[:max_results]
+
+
+def _submit_daemon(fn: Callable[..., Any], *args: Any) -> Future:
+    """
+    Run ``fn(*args)`` on a daemon thread and return its future.
+
+    ``ThreadPoolExecutor`` workers are joined at interpreter exit, so a
+    Knowledge Base call that outlives its timeout would keep the CLI
+    from exiting. A daemon thread is abandoned instead.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f"federated-{args[0] if args else ''}", daemon=True).start()
+    return future
+
+
+def federated_retrieve(
+    retrieve: Callable[[str, str, int], List[Dict[str, Any]]],
+    query: str,
+    kb_ids: Sequence[str],
+    max_results: int = 5,
+    timeout: float = 10.0,
+    method: str = 'minmax'
+) -> Dict[str, Any]:
+    """
+    Query several Knowledge Bases concurrently and merge the results.
+
+    Knowledge Bases that have not answered within ``timeout`` seconds
+    (or that raise) are reported and skipped; the merged ranking is built
+    from whatever arrived in time. Timed-out calls keep running on daemon
+    threads until they return, but never delay the caller or process exit.
+
+    Args:
+        retrieve: Function ``(query, kb_id, max_results) -> results``.
+        query: Search query text.
+        kb_ids: Knowledge Base IDs to query.
+        max_results: Results requested per Knowledge Base and returned overall.
+        timeout: Seconds to wait for each Knowledge Base (all run concurrently).
+        method: Fusion method ('minmax' or 'rrf').
+
+    Returns:
+        Dict with ``results`` (merged ranking), ``knowledge_bases``
+        (per-KB status, latency and count) and ``partial`` (True if any
+        Knowledge Base is missing from the results).
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}', expected one of {FUSION_METHODS}")
+
+    kb_ids = list(dict.fromkeys(kb_ids))
+    started = time.perf_counter()
+    finished_at: Dict[str, float] = {}
+
+    def timed_retrieve(kb_id: str) -> List[Dict[str, Any]]:
+        try:
+            return retrieve(query, kb_id, max_results)
+        finally:
+            finished_at[kb_id] = time.perf_counter()
+
+    futures = {kb_id: _submit_daemon(timed_retrieve, kb_id) for kb_id in kb_ids}
+    wait(futures.values(), timeout=timeout)
+
+    results_by_kb: Dict[str, List[Dict[str, Any]]] = {}
+    status: Dict[str, Dict[str, Any]] = {}
+
+    for kb_id, future in futures.items():
+        if not future.done():
+            future.cancel()
+            status[kb_id] = {'status': 'timeout', 'latency_ms': round(timeout * 1000)}
+            continue
+
+        latency_ms = round((finished_at.get(kb_id, time.perf_counter()) - started) * 1000)
+        error = future.exception()
+        if error is not None:
+            status[kb_id] = {'status': 'error', 'latency_ms': latency_ms, 'error': str(error)}
+            continue
+
+        results_by_kb[kb_id] = future.result()
+        status[kb_id] = {
+            'status': 'ok', 'latency_ms': latency_ms, 'count': len(results_by_kb[kb_id])
+        }
+
+    return {
+        'results': fuse_results(results_by_kb, method, max_results),
+        'knowledge_bases': status,
+        'partial': len(results_by_kb) < len(kb_ids)
+    }
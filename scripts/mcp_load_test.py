@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+MCP Server Load Test
+
+This module spawns ``mcp_server.py`` as a subprocess, pipes a configurable
+mix of ``tools/list`` and ``tools/call`` JSON-RPC messages through stdin
+at a target rate, and measures per-request latency, throughput, error
+rate and server RSS over time.
+
+Bedrock calls are served by a local stub endpoint (``StubBedrockServer``)
+through ``AWS_ENDPOINT_URL_BEDROCK_AGENT_RUNTIME`` with throwaway
+credentials, so no AWS account is needed.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+SERVER_SCRIPT = Path(__file__).resolve().parent.parent / "mcp_server.py"
+
+DEFAULT_MIX = "tools/list=1,invoke_bedrock_agent=3,retrieve_from_kb=3,federated_retrieve=1"
+
+STUB_PROFILE = "mcp-load-test"
+
+
+# ---------------------------------------------------------------------------
+# Stub Bedrock endpoint
+# ---------------------------------------------------------------------------
+
+def _encode_header(name: str, value: str) -> bytes:
+    name_bytes, value_bytes = name.encode('utf-8'), value.encode('utf-8')
+    return (struct.pack('>B', len(name_bytes)) + name_bytes
+            + struct.pack('>BH', 7, len(value_bytes)) + value_bytes)
+
+
+def encode_event(event_type: str, payload: Dict[str, Any]) -> bytes:
+    """
+    Encode one ``application/vnd.amazon.eventstream`` message.
+
+    Args:
+        event_type: Event name (e.g. ``chunk``).
+        payload: JSON payload of the event.
+
+    Returns:
+        Binary event stream message.
+    """
+    headers = (_encode_header(':message-type', 'event')
+               + _encode_header(':event-type', event_type)
+               + _encode_header(':content-type', 'application/json'))
+    body = json.dumps(payload).encode('utf-8')
+    total_length = 12 + len(headers) + len(body) + 4
+
+    prelude = struct.pack('>II', total_length, len(headers))
+    message = prelude + struct.pack('>I', zlib.crc32(prelude)) + headers + body
+    return message + struct.pack('>I', zlib.crc32(message))
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers Retrieve and InvokeAgent like bedrock-agent-runtime."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        stub = self.server.stub
+        time.sleep(stub.latency_ms / 1000)
+
+        if stub.error_rate and random.random() < stub.error_rate:
+            body = json.dumps({'message': 'stubbed failure'}).encode('utf-8')
+            self.send_response(400)
+            self.send_header('x-amzn-ErrorType', 'ValidationException')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        parts = self.path.strip('/').split('/')
+        if len(parts) == 3 and parts[0] == 'knowledgebases' and parts[2] == 'retrieve':
+            count = (request.get('retrievalConfiguration', {})
+                     .get('vectorSearchConfiguration', {}).get('numberOfResults', 5))
+            results = [
+                {
+                    'content': {'text': f"[{parts[1]}] stub chunk {i} for: {request['retrievalQuery']['text']}"},
+                    'location': {'type': 'S3', 's3Location': {'uri': f"s3://stub/{parts[1]}/{i}.txt"}},
+                    'score': round(1.0 - i * 0.1, 2)
+                }
+                for i in range(count)
+            ]
+            self._send(200, 'application/json', json.dumps({'retrievalResults': results}).encode('utf-8'))
+        elif len(parts) == 7 and parts[0] == 'agents' and parts[6] == 'text':
+            answer = f"Stub answer to: {request.get('inputText', '')}"
+            stream = b''.join(
+                encode_event('chunk', {'bytes': base64.b64encode(piece.encode('utf-8')).decode('ascii')})
+                for piece in (answer[:len(answer) // 2], answer[len(answer) // 2:])
+            )
+            self._send(200, 'application/vnd.amazon.eventstream', stream)
+        else:
+            self._send(404, 'application/json', b'{"message": "unknown stub route"}')
+
+
+class StubBedrockServer:
+    """Local HTTP stand-in for the bedrock-agent-runtime endpoint."""
+
+    def __init__(self, latency_ms: float = 20.0, error_rate: float = 0.0) -> None:
+        """
+        Initialize the stub server (bound to a free localhost port).
+
+        Args:
+            latency_ms: Artificial latency added to every call.
+            error_rate: Fraction of calls answered with an error.
+        """
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the stub endpoint."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'StubBedrockServer':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+def parse_mix(mix: str) -> List[Tuple[str, float]]:
+    """
+    Parse a request mix such as ``tools/list=1,retrieve_from_kb=3``.
+
+    Args:
+        mix: Comma-separated ``name=weight`` pairs. Names are
+            ``tools/list`` or a tool name for ``tools/call``.
+
+    Returns:
+        List of (name, weight) pairs.
+    """
+    entries = []
+    for part in mix.split(','):
+        name, _, weight = part.strip().partition('=')
+        entries.append((name, float(weight or 1)))
+    return entries
+
+
+def build_request(name: str, request_id: int) -> Dict[str, Any]:
+    """
+    Build a JSON-RPC request for a mix entry.
+
+    Args:
+        name: ``tools/list`` or a tool name.
+        request_id: JSON-RPC id.
+
+    Returns:
+        Request dict.
+    """
+    if name == 'tools/list':
+        return {'jsonrpc': '2.0', 'id': request_id, 'method': 'tools/list'}
+
+    query = f"load test question {request_id}"
+    arguments = {
+        'invoke_bedrock_agent': {
+            'agent_id': 'STUBAGENT', 'agent_alias_id': 'STUBALIAS',
+            'query': query, 'session_id': f"load-{request_id}"
+        },
+        'retrieve_from_kb': {'kb_id': 'STUBKB0001', 'query': query},
+        'federated_retrieve': {
+            'kb_ids': ['STUBKB0001', 'STUBKB0002', 'STUBKB0003'], 'query': query, 'timeout': 5
+        }
+    }[name]
+    return {
+        'jsonrpc': '2.0', 'id': request_id, 'method': 'tools/call',
+        'params': {'name': name, 'arguments': arguments}
+    }
+
+
+def is_error_response(line: str) -> bool:
+    """
+    Decide whether a server response line is an error.
+
+    Args:
+        line: Raw stdout line of the server.
+
+    Returns:
+        True for unparsable lines, ``error`` responses, tool results
+        reporting an error and partial federated results.
+    """
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return True
+    if not isinstance(response, dict) or 'error' in response:
+        return True
+
+    content = response.get('content') or []
+    text = content[0].get('text', '') if content else ''
+    if text.startswith('Error'):
+        return True
+    if text.startswith('{'):
+        # Only federated results are JSON; other text may just start with '{'
+        try:
+            result = json.loads(text)
+        except ValueError:
+            return False
+        return isinstance(result, dict) and bool(result.get('partial'))
+    return False
+
+
+def read_rss_kb(pid: int) -> Optional[int]:
+    """
+    Read resident set size of a process (Linux ``/proc``).
+
+    Args:
+        pid: Process ID.
+
+    Returns:
+        RSS in KB, or None where ``/proc`` is not available.
+    """
+    try:
+        with open(f"/proc/{pid}/status", encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _slope_per_hour(samples: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of (seconds, value) samples, per hour."""
+    if len(samples) < 2:
+        return 0.0
+    mean_t = statistics.mean(t for t, _ in samples)
+    mean_v = statistics.mean(v for _, v in samples)
+    denominator = sum((t - mean_t) ** 2 for t, _ in samples)
+    if not denominator:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in samples) / denominator * 3600
+
+
+class MCPLoadTest:
+    """Open-loop load generator for the MCP stdio server."""
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        duration: float = 60.0,
+        mix: str = DEFAULT_MIX,
+        max_in_flight: int = 1000,
+        report_interval: float = 10.0,
+        stub_latency_ms: float = 20.0,
+        stub_error_rate: float = 0.0,
+        drain_timeout: float = 60.0,
+        server_command: Optional[List[str]] = None
+    ) -> None:
+        """
+        Initialize the load test.
+
+        Args:
+            rate: Target requests per second.
+            duration: Test length in seconds.
+            mix: Request mix (see ``parse_mix``).
+            max_in_flight: Pause sending while this many requests are
+                unanswered (protects against unbounded pipe backlog).
+            report_interval: Seconds between progress reports.
+            stub_latency_ms: Latency of the stub Bedrock endpoint.
+            stub_error_rate: Fraction of stub calls that fail.
+            drain_timeout: Seconds to wait for outstanding responses after
+                the last request; unanswered requests are reported as lost.
+            server_command: Command to launch the server (defaults to
+                ``python mcp_server.py``).
+        """
+        self.rate = rate
+        self.duration = duration
+        self.mix = parse_mix(mix)
+        self.max_in_flight = max_in_flight
+        self.report_interval = report_interval
+        self.stub_latency_ms = stub_latency_ms
+        self.stub_error_rate = stub_error_rate
+        self.drain_timeout = drain_timeout
+        self.server_command = server_command or [sys.executable, str(SERVER_SCRIPT)]
+
+        self.lock = threading.Lock()
+        self.in_flight: Deque[Tuple[float, str]] = deque()
+        self.latencies: Dict[str, List[float]] = {name: [] for name, _ in self.mix}
+        self.window: List[float] = []
+        self.errors: Dict[str, int] = {name: 0 for name, _ in self.mix}
+        self.sent = 0
+        self.received = 0
+        self.rss_samples: List[Tuple[float, float]] = []
+        self.responses_done = threading.Event()
+
+    def _server_env(self, stub_url: str, credentials_path: str) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update({
+            'AWS_PROFILE': STUB_PROFILE,
+            'AWS_SHARED_CREDENTIALS_FILE': credentials_path,
+            'AWS_CONFIG_FILE': credentials_path,
+            'AWS_ENDPOINT_URL_BEDROCK_AGENT_RUNTIME': stub_url,
+            'AWS_MAX_ATTEMPTS': '1'
+        })
+        return env
+
+    def _read_responses(self, stdout: Any) -> None:
+        for line in stdout:
+            received_at = time.perf_counter()
+            with self.lock:
+                if not self.in_flight:
+                    continue
+                sent_at, name = self.in_flight.popleft()
+                latency_ms = (received_at - sent_at) * 1000
+                self.latencies[name].append(latency_ms)
+                self.window.append(latency_ms)
+                self.received += 1
+                if is_error_response(line):
+                    self.errors[name] += 1
+        self.responses_done.set()
+
+    def _report(self, elapsed: float, pid: int) -> None:
+        rss_kb = read_rss_kb(pid)
+        with self.lock:
+            window, self.window = sorted(self.window), []
+            sent, received = self.sent, self.received
+            errors = sum(self.errors.values())
+            backlog = len(self.in_flight)
+        if rss_kb is not None:
+            self.rss_samples.append((elapsed, rss_kb / 1024))
+
+        p50 = window[len(window) // 2] if window else 0.0
+        p99 = window[min(int(len(window) * 0.99), len(window) - 1)] if window else 0.0
+        rss = f"{rss_kb / 1024:.1f} MB" if rss_kb is not None else "n/a"
+        print(f"[{elapsed:7.0f}s] sent {sent} | recv {received} | backlog {backlog} "
+              f"| {len(window) / self.report_interval:.1f} rps | p50 {p50:.1f} ms "
+              f"| p99 {p99:.1f} ms | errors {errors} | rss {rss}", flush=True)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the load test.
+
+        Returns:
+            Summary with throughput, per-request-type latency percentiles,
+            error rate and RSS growth.
+        """
+        names = [name for name, _ in self.mix]
+        weights = [weight for _, weight in self.mix]
+
+        with StubBedrockServer(self.stub_latency_ms, self.stub_error_rate) as stub, \
+                tempfile.NamedTemporaryFile('w', suffix='.ini', delete=False) as credentials:
+            credentials.write(
+                f"[{STUB_PROFILE}]\naws_access_key_id = stub\naws_secret_access_key = stub\n"
+                f"[profile {STUB_PROFILE}]\nregion = us-east-1\n"
+            )
+            credentials.close()
+
+            process = subprocess.Popen(
+                self.server_command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                env=self._server_env(stub.url, credentials.name),
+                text=True,
+                bufsize=1
+            )
+            reader = threading.Thread(target=self._read_responses, args=(process.stdout,), daemon=True)
+            reader.start()
+
+            start = time.perf_counter()
+            next_send = start
+            next_report = start + self.report_interval
+            request_id = 0
+            final_rss_kb = None
+
+            try:
+                while True:
+                    now = time.perf_counter()
+                    if now - start >= self.duration or process.poll() is not None:
+                        break
+                    if now >= next_report:
+                        self._report(now - start, process.pid)
+                        next_report += self.report_interval
+                    if now < next_send:
+                        time.sleep(min(next_send - now, next_report - now, 0.05))
+                        continue
+                    with self.lock:
+                        backlog = len(self.in_flight)
+                    if backlog >= self.max_in_flight:
+                        time.sleep(0.005)
+                        continue
+
+                    request_id += 1
+                    name = random.choices(names, weights)[0]
+                    with self.lock:
+                        self.in_flight.append((time.perf_counter(), name))
+                        self.sent += 1
+                    process.stdin.write(json.dumps(build_request(name, request_id)) + '\n')
+                    process.stdin.flush()
+                    next_send += 1.0 / self.rate
+
+                # Last RSS sample while the server is still alive; closing
+                # stdin makes it exit
+                final_rss_kb = read_rss_kb(process.pid)
+                final_elapsed = time.perf_counter() - start
+
+                # Drain outstanding responses
+                process.stdin.close()
+                self.responses_done.wait(timeout=self.drain_timeout)
+            finally:
+                if process.poll() is None:
+                    process.terminate()
+                process.wait(timeout=10)
+                os.unlink(credentials.name)
+
+        elapsed = time.perf_counter() - start
+        if final_rss_kb is not None:
+            self.rss_samples.append((final_elapsed, final_rss_kb / 1024))
+        return self._summary(elapsed, process.returncode)
+
+    def _summary(self, elapsed: float, exit_code: Optional[int]) -> Dict[str, Any]:
+        per_type = {}
+        for name, timings in self.latencies.items():
+            timings = sorted(timings)
+            if not timings:
+                continue
+            per_type[name] = {
+                'count': len(timings),
+                'errors': self.errors[name],
+                'p50_ms': round(timings[len(timings) // 2], 1),
+                'p95_ms': round(timings[min(int(len(timings) * 0.95), len(timings) - 1)], 1),
+                'p99_ms': round(timings[min(int(len(timings) * 0.99), len(timings) - 1)], 1),
+                'max_ms': round(timings[-1], 1)
+            }
+
+        errors = sum(self.errors.values())
+        rss = [value for _, value in self.rss_samples]
+        # Skip the first sample so import/startup does not count as growth
+        steady = self.rss_samples[1:] if len(self.rss_samples) > 2 else self.rss_samples
+
+        return {
+            'elapsed_seconds': round(elapsed, 1),
+            'target_rps': self.rate,
+            'sent': self.sent,
+            'received': self.received,
+            'lost': self.sent - self.received,
+            'throughput_rps': round(self.received / elapsed, 2) if elapsed else 0.0,
+            'error_rate': round(errors / self.received, 4) if self.received else 0.0,
+            'server_exit_code': exit_code,
+            'latency': per_type,
+            'rss_mb': {
+                'start': round(rss[0], 1) if rss else None,
+                'end': round(rss[-1], 1) if rss else None,
+                'max': round(max(rss), 1) if rss else None,
+                'growth_per_hour': round(_slope_per_hour(steady), 1) if len(steady) >= 2 else None
+            }
+        }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """
+    Print a load test summary.
+
+    Args:
+        summary: Result of ``MCPLoadTest.run``.
+    """
+    print("=" * 70)
+    print("MCP Server Load Test Summary")
+    print("=" * 70)
+    print(f"Duration:      {summary['elapsed_seconds']}s (target {summary['target_rps']} rps)")
+    print(f"Requests:      sent {summary['sent']}, received {summary['received']}, "
+          f"lost {summary['lost']}")
+    print(f"Throughput:    {summary['throughput_rps']} rps")
+    print(f"Error rate:    {summary['error_rate'] * 100:.2f}%")
+    rss = summary['rss_mb']
+    growth = f"{rss['growth_per_hour']} MB/h" if rss['growth_per_hour'] is not None else "n/a"
+    print(f"RSS (MB):      start {rss['start']} | end {rss['end']} | max {rss['max']} "
+          f"| growth {growth}")
+    print(f"\n{'Request':<24}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in summary['latency'].items():
+        print(f"{name:<24}{stats['count']:>8}{stats['errors']:>8}{stats['p50_ms']:>10}"
+              f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    if summary['server_exit_code'] not in (None, 0, -15):
+        print(f"\n❌ Server exited with code {summary['server_exit_code']}")
+
+
+def main() -> None:
+    """Main function for CLI usage."""
+    parser = argparse.ArgumentParser(description="Load and soak test for the MCP stdio server")
+    parser.add_argument('--rate', type=float, default=20.0, help='Target requests per second')
+    parser.add_argument('--duration', type=float, default=60.0, help='Test length in seconds')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f'Request mix as name=weight pairs (default: {DEFAULT_MIX})')
+    parser.add_argument('--max-in-flight', type=int, default=1000,
+                        help='Pause sending while this many requests are unanswered')
+    parser.add_argument('--report-interval', type=float, default=10.0,
+                        help='Seconds between progress lines')
+    parser.add_argument('--stub-latency-ms', type=float, default=20.0,
+                        help='Latency of the stub Bedrock endpoint')
+    parser.add_argument('--stub-error-rate', type=float, default=0.0,
+                        help='Fraction of stub Bedrock calls that fail')
+    parser.add_argument('--drain-timeout', type=float, default=60.0,
+                        help='Seconds to wait for outstanding responses at the end')
+    parser.add_argument('--json', metavar='PATH', help='Also write the summary as JSON')
+    args = parser.parse_args()
+
+    load_test = MCPLoadTest(
+        rate=args.rate,
+        duration=args.duration,
+        mix=args.mix,
+        max_in_flight=args.max_in_flight,
+        report_interval=args.report_interval,
+        stub_latency_ms=args.stub_latency_ms,
+        stub_error_rate=args.stub_error_rate,
+        drain_timeout=args.drain_timeout
+    )
+    summary = load_test.run()
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
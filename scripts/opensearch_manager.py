@@ -7,34 +7,178 @@ OpenSearch Serverless indexes with FAISS engine for Bedrock Knowledge Base.
 """
 
 import json
-from typing import Dict, Any, Optional
+import random
+import time
+from typing import Callable, Dict, Any, List, Optional
 
 import boto3
 from opensearchpy import OpenSearch, RequestsHttpConnection, AWSV4SignerAuth
 
 from .config import config
+from .query_profiler import format_profile_report, parse_profile, query_shape, rank_query_shapes, search_stats_delta
+
+
+# Titan Embeddings output sizes: v1 is fixed at 1536, v2 supports 256/512/1024
+SUPPORTED_DIMENSIONS = (256, 512, 1024, 1536)
+EMBEDDING_DATA_TYPES = ('float', 'binary')
+
+DEFAULT_DIMENSION = getattr(config, 'EMBEDDING_DIMENSION', 1536)
+DEFAULT_DATA_TYPE = getattr(config, 'EMBEDDING_DATA_TYPE', 'float')
+
+# SigV4 service names: 'aoss' for Serverless collections, 'es' for managed domains
+OPENSEARCH_SERVICES = ('aoss', 'es')
+DEFAULT_SERVICE = getattr(config, 'OPENSEARCH_SERVICE', 'aoss')
+
+
+def build_vector_mapping(
+    dimension: int = DEFAULT_DIMENSION,
+    data_type: str = DEFAULT_DATA_TYPE,
+    engine: str = "faiss"
+) -> Dict[str, Any]:
+    """
+    Build the knn_vector field mapping for an embedding configuration.
+    
+    Float vectors use L2 distance; binary vectors are stored bit-packed
+    and compared with Hamming distance (FAISS only).
+    
+    Args:
+        dimension: Vector dimension (256, 512, 1024 or 1536).
+        data_type: Embedding data type ('float' or 'binary').
+        engine: Vector engine type (faiss or nmslib).
+        
+    Returns:
+        Dict with the knn_vector field mapping.
+        
+    Raises:
+        ValueError: If the combination is not supported.
+    """
+    if dimension not in SUPPORTED_DIMENSIONS:
+        raise ValueError(f"Unsupported dimension {dimension}, expected one of {SUPPORTED_DIMENSIONS}")
+    if data_type not in EMBEDDING_DATA_TYPES:
+        raise ValueError(f"Unsupported data type '{data_type}', expected one of {EMBEDDING_DATA_TYPES}")
+    
+    mapping = {
+        'type': 'knn_vector',
+        'dimension': dimension,
+        'method': {
+            'engine': engine,
+            'space_type': 'l2',
+            'name': 'hnsw'
+        }
+    }
+    
+    if data_type == 'binary':
+        if engine != 'faiss':
+            raise ValueError("Binary vectors require the faiss engine")
+        if dimension == 1536:
+            raise ValueError("Binary embeddings require Titan v2 (256, 512 or 1024 dimensions)")
+        mapping['data_type'] = 'binary'
+        mapping['method']['space_type'] = 'hamming'
+    
+    return mapping
+
+
+def estimate_vector_memory(
+    num_vectors: int,
+    dimension: int = DEFAULT_DIMENSION,
+    data_type: str = DEFAULT_DATA_TYPE,
+    m: int = 16
+) -> int:
+    """
+    Estimate native memory used by a FAISS HNSW graph.
+    
+    Uses the OpenSearch k-NN sizing formula
+    ``1.1 * (bytes_per_vector + 8 * m) * num_vectors``.
+    
+    Args:
+        num_vectors: Number of indexed vectors.
+        dimension: Vector dimension.
+        data_type: Embedding data type ('float' or 'binary').
+        m: HNSW ``m`` parameter (graph links per node).
+        
+    Returns:
+        Estimated memory in bytes.
+    """
+    bytes_per_vector = dimension // 8 if data_type == 'binary' else 4 * dimension
+    return int(1.1 * (bytes_per_vector + 8 * m) * num_vectors)
+
+
+def summarize_knn_stats(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the useful parts of a ``_plugins/_knn/stats`` response.
+    
+    Args:
+        response: Raw k-NN stats response.
+        
+    Returns:
+        Dict with ``available``, cluster-level flags and a per-node summary.
+    """
+    nodes = {}
+    for node_id, stats in response.get('nodes', {}).items():
+        nodes[node_id] = {
+            'graph_memory_usage_kb': stats.get('graph_memory_usage', 0),
+            'graph_memory_usage_percentage': stats.get('graph_memory_usage_percentage', 0.0),
+            'cache_capacity_reached': stats.get('cache_capacity_reached', False),
+            'hit_count': stats.get('hit_count', 0),
+            'miss_count': stats.get('miss_count', 0),
+            'eviction_count': stats.get('eviction_count', 0),
+            'graph_query_requests': stats.get('graph_query_requests', 0),
+            'knn_query_requests': stats.get('knn_query_requests', 0),
+            'total_load_time_ns': stats.get('total_load_time', 0),
+            'indices': {
+                index: {
+                    'graph_memory_usage_kb': info.get('graph_memory_usage', 0),
+                    'graph_count': info.get('graph_count', 0)
+                }
+                for index, info in stats.get('indices_in_cache', {}).items()
+            }
+        }
+    
+    return {
+        'available': True,
+        'cluster_name': response.get('cluster_name'),
+        'circuit_breaker_triggered': response.get('circuit_breaker_triggered', False),
+        'nodes': nodes
+    }
 
 
 class OpenSearchManager:
-    """Manager for OpenSearch Serverless operations."""
+    """Manager for OpenSearch Serverless (and managed domain) operations."""
     
     def __init__(
         self,
         collection_endpoint: Optional[str] = None,
         profile_name: Optional[str] = None,
-        region_name: Optional[str] = None
+        region_name: Optional[str] = None,
+        client: Optional[OpenSearch] = None,
+        service: Optional[str] = None
     ) -> None:
         """
         Initialize OpenSearch Manager.
         
         Args:
-            collection_endpoint: OpenSearch collection endpoint URL.
+            collection_endpoint: OpenSearch collection (or domain) endpoint URL.
             profile_name: AWS profile name.
             region_name: AWS region name.
+            client: Pre-built OpenSearch client (e.g. a local stand-in);
+                skips AWS authentication when provided.
+            service: 'aoss' for a Serverless collection or 'es' for a
+                managed OpenSearch Service domain (uses config if not provided).
+            
+        Raises:
+            ValueError: If the service is unknown.
         """
         self.profile_name = profile_name or config.AWS_PROFILE
         self.region_name = region_name or config.AWS_REGION
         self.collection_endpoint = collection_endpoint or config.opensearch_endpoint
+        self.service = service or DEFAULT_SERVICE
+        
+        if self.service not in OPENSEARCH_SERVICES:
+            raise ValueError(f"Unknown service '{self.service}', expected one of {OPENSEARCH_SERVICES}")
+        
+        if client is not None:
+            self.client = client
+            return
         
         # Extract host from endpoint
         self.host = self.collection_endpoint.replace("https://", "").replace("http://", "")
@@ -42,7 +186,7 @@ class OpenSearchManager:
         # Initialize AWS session and auth
         session = boto3.Session(profile_name=self.profile_name, region_name=self.region_name)
         credentials = session.get_credentials()
-        self.auth = AWSV4SignerAuth(credentials, self.region_name, 'aoss')
+        self.auth = AWSV4SignerAuth(credentials, self.region_name, self.service)
         
         # Initialize OpenSearch client
         self.client = OpenSearch(
@@ -57,21 +201,24 @@ class OpenSearchManager:
     def create_index(
         self,
         index_name: str = "bedrock-knowledge-base-index",
-        dimension: int = 1536,
-        engine: str = "faiss"
+        dimension: int = DEFAULT_DIMENSION,
+        engine: str = "faiss",
+        data_type: str = DEFAULT_DATA_TYPE
     ) -> Dict[str, Any]:
         """
         Create OpenSearch index with FAISS engine.
         
         Args:
             index_name: Name of the index to create.
-            dimension: Vector dimension (1536 for Titan embeddings).
+            dimension: Vector dimension (1536 for Titan v1; 256/512/1024 for Titan v2).
             engine: Vector engine type (faiss or nmslib).
+            data_type: Embedding data type ('float' or 'binary').
             
         Returns:
             Dict containing the creation response.
             
         Raises:
+            ValueError: If the embedding configuration is not supported.
             Exception: If index creation fails.
         """
         index_body = {
@@ -80,15 +227,9 @@ class OpenSearchManager:
             },
             'mappings': {
                 'properties': {
-                    'bedrock-knowledge-base-default-vector': {
-                        'type': 'knn_vector',
-                        'dimension': dimension,
-                        'method': {
-                            'engine': engine,
-                            'space_type': 'l2',
-                            'name': 'hnsw'
-                        }
-                    },
+                    'bedrock-knowledge-base-default-vector': build_vector_mapping(
+                        dimension, data_type, engine
+                    ),
                     'AMAZON_BEDROCK_TEXT_CHUNK': {'type': 'text'},
                     'AMAZON_BEDROCK_METADATA': {'type': 'text'}
                 }
@@ -125,7 +266,8 @@ class OpenSearchManager:
     def recreate_index(
         self,
         index_name: str = "bedrock-knowledge-base-index",
-        dimension: int = 1536
+        dimension: int = DEFAULT_DIMENSION,
+        data_type: str = DEFAULT_DATA_TYPE
     ) -> Dict[str, Any]:
         """
         Delete and recreate index with FAISS engine.
@@ -133,6 +275,7 @@ class OpenSearchManager:
         Args:
             index_name: Name of the index to recreate.
             dimension: Vector dimension.
+            data_type: Embedding data type ('float' or 'binary').
             
         Returns:
             Dict containing the creation response.
@@ -140,11 +283,190 @@ class OpenSearchManager:
         print(f"Deleting index: {index_name}...")
         self.delete_index(index_name)
         
-        print(f"Creating index with FAISS engine...")
-        response = self.create_index(index_name, dimension, engine='faiss')
+        print(f"Creating index with FAISS engine ({dimension}-dim {data_type})...")
+        response = self.create_index(index_name, dimension, engine='faiss', data_type=data_type)
         
         print("Index created successfully!")
         return response
+    
+    def _vector_mapping(self, index_name: str) -> Dict[str, Any]:
+        mapping = self.get_index_info(index_name)[index_name]['mappings']['properties']
+        return mapping['bedrock-knowledge-base-default-vector']
+    
+    def warmup_index(
+        self,
+        index_name: str = "bedrock-knowledge-base-index",
+        num_queries: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Load the index's HNSW graphs into native memory.
+        
+        Without warmup, graphs are loaded lazily by the first queries that
+        hit each segment, which makes those queries very slow. Run it after
+        ingestion, not on an empty index. Managed domains use the k-NN
+        plugin warmup API; Serverless collections do not expose it, so a
+        few k-NN queries with random vectors are run instead.
+        
+        Args:
+            index_name: Name of the index to warm up.
+            num_queries: Number of warmup queries (Serverless only).
+            
+        Returns:
+            Dict with the shard summary of the warmup operation (domains),
+            or the latencies of the warmup queries (Serverless).
+        """
+        if self.service == 'es':
+            return self.client.transport.perform_request(
+                'GET', f'/_plugins/_knn/warmup/{index_name}'
+            )
+        
+        vector = self._vector_mapping(index_name)
+        dimension = vector['dimension']
+        binary = vector.get('data_type') == 'binary'
+        
+        def make_vector() -> List[float]:
+            if binary:
+                # Binary vectors are queried bit-packed as signed bytes
+                return [random.randint(-128, 127) for _ in range(dimension // 8)]
+            return [random.uniform(-1.0, 1.0) for _ in range(dimension)]
+        
+        took_ms = []
+        for _ in range(num_queries):
+            response = self.client.search(index=index_name, body={
+                'size': 1,
+                '_source': False,
+                'query': {'knn': {'bedrock-knowledge-base-default-vector': {
+                    'vector': make_vector(), 'k': 10
+                }}}
+            })
+            took_ms.append(response['took'])
+        
+        return {'index': index_name, 'method': 'knn_queries', 'took_ms': took_ms}
+    
+    def get_knn_stats(self) -> Dict[str, Any]:
+        """
+        Get k-NN plugin statistics summarized per node.
+        
+        Returns:
+            Dict with cluster-level flags and, per node, graph memory usage,
+            cache hits/misses, evictions, query counts and per-index graph
+            memory. Memory values are in KB, as reported by the plugin.
+            Serverless collections do not expose the stats API; the result
+            then only has ``available`` (False) and ``reason``.
+        """
+        if self.service == 'aoss':
+            return {
+                'available': False,
+                'reason': "OpenSearch Serverless does not expose k-NN plugin stats; "
+                          "use 'estimate' or 'searchstats' instead"
+            }
+        
+        response = self.client.transport.perform_request('GET', '/_plugins/_knn/stats')
+        return summarize_knn_stats(response)
+    
+    def estimate_index_memory(self, index_name: str = "bedrock-knowledge-base-index") -> Dict[str, Any]:
+        """
+        Estimate HNSW graph memory for an existing index.
+        
+        Reads dimension, data type and HNSW ``m`` from the index mapping
+        and the vector count from the index.
+        
+        Args:
+            index_name: Name of the index to inspect.
+            
+        Returns:
+            Dict with the inputs used and the estimated bytes.
+        """
+        vector = self._vector_mapping(index_name)
+        dimension = vector['dimension']
+        data_type = vector.get('data_type', 'float')
+        m = vector.get('method', {}).get('parameters', {}).get('m', 16)
+        num_vectors = self.client.count(index=index_name)['count']
+        
+        return {
+            'index': index_name,
+            'num_vectors': num_vectors,
+            'dimension': dimension,
+            'data_type': data_type,
+            'm': m,
+            'estimated_bytes': estimate_vector_memory(num_vectors, dimension, data_type, m)
+        }
+    
+    def profile_query(
+        self,
+        query_body: Dict[str, Any],
+        index_name: str = "bedrock-knowledge-base-index"
+    ) -> Dict[str, Any]:
+        """
+        Run a k-NN/hybrid query with profiling and parse the timings.
+        
+        Args:
+            query_body: Search request body.
+            index_name: Name of the index to query.
+            
+        Returns:
+            Parsed profile (see ``query_profiler.parse_profile``).
+        """
+        body = dict(query_body, profile=True)
+        response = self.client.search(index=index_name, body=body)
+        return parse_profile(response)
+    
+    def replay_query_log(
+        self,
+        log_path: str,
+        index_name: str = "bedrock-knowledge-base-index",
+        repeat: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Replay a captured query log and rank query shapes by latency.
+        
+        Args:
+            log_path: JSONL file with one search body per line (or
+                ``{"body": {...}}`` objects).
+            index_name: Name of the index to query.
+            repeat: Number of times to run each query.
+            
+        Returns:
+            Query shapes ranked slowest first (see
+            ``query_profiler.rank_query_shapes``).
+        """
+        samples = []
+        with open(log_path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                body = entry.get('body', entry)
+                shape = query_shape(body)
+                for _ in range(repeat):
+                    response = self.client.search(index=index_name, body=body)
+                    samples.append({'shape': shape, 'took_ms': response['took']})
+        
+        return rank_query_shapes(samples)
+    
+    def get_search_stats(
+        self,
+        index_name: str = "bedrock-knowledge-base-index",
+        window_seconds: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> Dict[str, Any]:
+        """
+        Measure index-level search rate and latency over a time window.
+        
+        Samples ``_stats/search`` at the start and end of the window.
+        
+        Args:
+            index_name: Name of the index to inspect.
+            window_seconds: Length of the window in seconds.
+            sleep: Sleep function (injectable for tests).
+            
+        Returns:
+            Dict with query counts, rates and average latencies.
+        """
+        before = self.client.indices.stats(index=index_name, metric='search')
+        sleep(window_seconds)
+        after = self.client.indices.stats(index=index_name, metric='search')
+        return search_stats_delta(before, after, index_name, window_seconds)
 
 
 def main() -> None:
@@ -154,13 +476,20 @@ def main() -> None:
     manager = OpenSearchManager()
     
     if len(sys.argv) < 2:
-        print("Usage: python opensearch_manager.py [create|delete|check|recreate]")
+        print("Usage: python opensearch_manager.py "
+              "[create|delete|check|recreate|warmup|stats|estimate] [dimension] [float|binary]")
+        print("       python opensearch_manager.py profile <query.json>")
+        print("       python opensearch_manager.py replay <queries.jsonl> [repeat]")
+        print("       python opensearch_manager.py searchstats [window_seconds]")
         sys.exit(1)
     
     command = sys.argv[1]
+    if command in ("create", "recreate"):
+        dimension = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DIMENSION
+        data_type = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_DATA_TYPE
     
     if command == "create":
-        response = manager.create_index()
+        response = manager.create_index(dimension=dimension, data_type=data_type)
         print(json.dumps(response, indent=2))
     elif command == "delete":
         response = manager.delete_index()
@@ -169,7 +498,33 @@ def main() -> None:
         response = manager.get_index_info()
         print(json.dumps(response, indent=2))
     elif command == "recreate":
-        response = manager.recreate_index()
+        response = manager.recreate_index(dimension=dimension, data_type=data_type)
+        print(json.dumps(response, indent=2))
+    elif command == "warmup":
+        response = manager.warmup_index()
+        print(json.dumps(response, indent=2))
+    elif command == "stats":
+        response = manager.get_knn_stats()
+        if not response['available']:
+            print(f"k-NN stats unavailable: {response['reason']}")
+            sys.exit(1)
+        print(json.dumps(response, indent=2))
+    elif command == "estimate":
+        response = manager.estimate_index_memory()
+        response['estimated_mb'] = round(response['estimated_bytes'] / 1024 / 1024, 1)
+        print(json.dumps(response, indent=2))
+    elif command == "profile":
+        with open(sys.argv[2], encoding='utf-8') as f:
+            report = manager.profile_query(json.load(f))
+        print(format_profile_report(report))
+    elif command == "replay":
+        repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+        for entry in manager.replay_query_log(sys.argv[2], repeat=repeat):
+            print(f"p95 {entry['p95_ms']:>8} ms  p50 {entry['p50_ms']:>8} ms  "
+                  f"max {entry['max_ms']:>8} ms  n={entry['count']:<5} {entry['shape'][:100]}")
+    elif command == "searchstats":
+        window = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+        response = manager.get_search_stats(window_seconds=window)
         print(json.dumps(response, indent=2))
     else:
         print(f"Unknown command: {command}")
@@ -0,0 +1,758 @@
+#!/usr/bin/env python3
+"""
+Corpus Preprocessing and Near-Duplicate Elimination
+
+This module streams a document corpus (S3 prefix or local directory),
+extracts and normalizes text on a process pool, drops or merges
+near-duplicate documents with MinHash + LSH, and uploads the surviving
+documents to the Knowledge Base bucket with concurrent multipart transfers.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import struct
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from .config import config
+
+
+# Hierarchical chunking settings (keep in sync with terraform/knowledge_base.tf)
+PARENT_MAX_TOKENS = 1500
+CHILD_MAX_TOKENS = 300
+OVERLAP_TOKENS = 60
+
+# Rough characters-per-token ratio used for token estimates
+CHARS_PER_TOKEN = 4
+
+METADATA_SUFFIX = '.metadata.json'
+
+# Bedrock caps list metadata values; keep the sidecar well below that
+MAX_DUPLICATE_SOURCES = 50
+
+TEXT_EXTENSIONS = {'.txt', '.md', '.csv', '.json'}
+HTML_EXTENSIONS = {'.html', '.htm'}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TAG_RE = re.compile(r'<(script|style)[^>]*>.*?</\1>|<[^>]+>', re.DOTALL | re.IGNORECASE)
+_WORD_RE = re.compile(r'\w+')
+
+
+# ---------------------------------------------------------------------------
+# Text extraction and normalization
+# ---------------------------------------------------------------------------
+
+def extract_text(data: bytes, key: str) -> Optional[str]:
+    """
+    Extract plain text from a document.
+
+    Args:
+        data: Raw document bytes.
+        key: Object key or file name (used to detect the format).
+
+    Returns:
+        Extracted text, or None if the format is not supported.
+    """
+    suffix = Path(key).suffix.lower()
+
+    if suffix in TEXT_EXTENSIONS:
+        return data.decode('utf-8', errors='replace')
+
+    if suffix in HTML_EXTENSIONS:
+        return html.unescape(_TAG_RE.sub(' ', data.decode('utf-8', errors='replace')))
+
+    if suffix == '.pdf':
+        try:
+            from io import BytesIO
+            from pypdf import PdfReader
+        except ImportError:
+            return None
+        reader = PdfReader(BytesIO(data))
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+    return None
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for near-duplicate detection.
+
+    Applies Unicode NFKC folding, lowercasing and whitespace/punctuation
+    collapsing so that formatting-only differences do not matter.
+
+    Args:
+        text: Raw extracted text.
+
+    Returns:
+        Normalized text.
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    return ' '.join(_WORD_RE.findall(text))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of embedding tokens for a text.
+
+    Args:
+        text: Document text.
+
+    Returns:
+        Approximate token count.
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_chunks(
+    tokens: int,
+    parent_tokens: int = PARENT_MAX_TOKENS,
+    child_tokens: int = CHILD_MAX_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS
+) -> int:
+    """
+    Estimate parent + child chunks produced by hierarchical chunking.
+
+    Args:
+        tokens: Document token count.
+        parent_tokens: Parent chunk size.
+        child_tokens: Child chunk size.
+        overlap_tokens: Overlap between child chunks.
+
+    Returns:
+        Approximate number of chunks (parents + children).
+    """
+    if tokens <= 0:
+        return 0
+    parents = math.ceil(tokens / parent_tokens)
+    children = math.ceil(max(tokens - overlap_tokens, 1) / (child_tokens - overlap_tokens))
+    return parents + children
+
+
+# ---------------------------------------------------------------------------
+# MinHash + LSH
+# ---------------------------------------------------------------------------
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """
+    Build hashed word shingles for a normalized text.
+
+    Args:
+        text: Normalized text.
+        size: Number of words per shingle.
+
+    Returns:
+        Set of 32-bit shingle hashes.
+    """
+    words = text.split()
+    if len(words) < size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = (' '.join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+    return {
+        struct.unpack('<I', hashlib.blake2b(g.encode('utf-8'), digest_size=4).digest())[0]
+        for g in grams
+    }
+
+
+class MinHasher:
+    """MinHash signature generator using universal hash permutations."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1) -> None:
+        """
+        Initialize MinHasher.
+
+        Args:
+            num_perm: Number of hash permutations (signature length).
+            seed: Seed for the permutation coefficients.
+        """
+        self.num_perm = num_perm
+
+        coefficients = []
+        for i in range(num_perm):
+            digest = hashlib.blake2b(f'{seed}:{i}'.encode('utf-8'), digest_size=16).digest()
+            a, b = struct.unpack('<QQ', digest)
+            coefficients.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+        self.coefficients = coefficients
+
+    def signature(self, shingle_hashes: Set[int]) -> Tuple[int, ...]:
+        """
+        Compute the MinHash signature of a shingle set.
+
+        Args:
+            shingle_hashes: Hashed shingles of a document.
+
+        Returns:
+            Signature tuple of length num_perm.
+        """
+        if not shingle_hashes:
+            return (_MAX_HASH,) * self.num_perm
+
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in shingle_hashes)
+            for a, b in self.coefficients
+        )
+
+
+def estimate_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """
+    Estimate Jaccard similarity from two MinHash signatures.
+
+    Args:
+        sig_a: First signature.
+        sig_b: Second signature.
+
+    Returns:
+        Fraction of matching signature positions.
+    """
+    matches = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+    return matches / len(sig_a)
+
+
+class LSHIndex:
+    """Banded locality-sensitive hashing index over MinHash signatures."""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32) -> None:
+        """
+        Initialize LSH index.
+
+        Args:
+            num_perm: Signature length (must be divisible by bands).
+            bands: Number of bands. More bands find less similar candidates.
+
+        Raises:
+            ValueError: If num_perm is not divisible by bands.
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets: List[Dict[Tuple[int, ...], List[str]]] = [{} for _ in range(bands)]
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature[start:start + self.rows]
+
+    def insert(self, key: str, signature: Tuple[int, ...]) -> None:
+        """
+        Add a document signature to the index.
+
+        Args:
+            key: Document identifier.
+            signature: MinHash signature.
+        """
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band].setdefault(band_key, []).append(key)
+
+    def query(self, signature: Tuple[int, ...], threshold: float) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed document above a threshold.
+
+        Args:
+            signature: MinHash signature to look up.
+            threshold: Minimum estimated Jaccard similarity.
+
+        Returns:
+            Tuple of (key, similarity) for the best match, or None.
+        """
+        candidates: Set[str] = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(band_key, ()))
+
+        best = None
+        for key in candidates:
+            similarity = estimate_jaccard(signature, self.signatures[key])
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+
+# ---------------------------------------------------------------------------
+# Corpus sources and workers
+# ---------------------------------------------------------------------------
+
+def parse_location(location: str) -> Tuple[Optional[str], str]:
+    """
+    Split an ``s3://bucket/prefix`` URI or local path.
+
+    Args:
+        location: S3 URI or local directory path.
+
+    Returns:
+        Tuple of (bucket, prefix). Bucket is None for local paths.
+    """
+    if location.startswith('s3://'):
+        bucket, _, prefix = location[5:].partition('/')
+        return bucket, prefix
+    return None, location
+
+
+def directory_prefix(prefix: str) -> str:
+    """
+    Treat an S3 prefix as a directory.
+
+    ``raw`` would also match ``raw-old/...``; ``raw/`` only matches the
+    objects under it.
+
+    Args:
+        prefix: S3 key prefix (may be empty).
+
+    Returns:
+        Prefix ending in ``/`` (or empty).
+    """
+    return prefix if not prefix or prefix.endswith('/') else prefix + '/'
+
+
+def iter_source_keys(
+    source: str,
+    profile_name: Optional[str] = None,
+    region_name: Optional[str] = None,
+    sidecars: Optional[Set[str]] = None
+) -> Iterator[str]:
+    """
+    Stream document keys from an S3 prefix or local directory.
+
+    Keys are yielded in sorted order (S3 lists keys lexicographically),
+    which makes the choice of surviving duplicate reproducible.
+
+    Args:
+        source: ``s3://bucket/prefix`` URI or local directory.
+        profile_name: AWS profile name.
+        region_name: AWS region name.
+        sidecars: Optional set that collects the ``.metadata.json``
+            sidecar keys found while listing.
+
+    Yields:
+        Object keys (S3) or file paths (local), skipping metadata sidecars.
+    """
+    bucket, prefix = parse_location(source)
+
+    def is_sidecar(key: str) -> bool:
+        if key.endswith(METADATA_SUFFIX):
+            if sidecars is not None:
+                sidecars.add(key)
+            return True
+        return False
+
+    if bucket is None:
+        for path in sorted(Path(prefix).rglob('*')):
+            if path.is_file() and not is_sidecar(str(path)):
+                yield str(path)
+        return
+
+    session = boto3.Session(profile_name=profile_name, region_name=region_name)
+    paginator = session.client('s3').get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=directory_prefix(prefix)):
+        for obj in page.get('Contents', []):
+            key = obj['Key']
+            if not key.endswith('/') and not is_sidecar(key):
+                yield key
+
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    bucket: Optional[str],
+    profile_name: Optional[str],
+    region_name: Optional[str],
+    num_perm: int,
+    shingle_size: int
+) -> None:
+    """Create per-process S3 client and MinHasher."""
+    if bucket is not None:
+        session = boto3.Session(profile_name=profile_name, region_name=region_name)
+        _worker_state['s3'] = session.client('s3')
+    _worker_state['bucket'] = bucket
+    _worker_state['hasher'] = MinHasher(num_perm)
+    _worker_state['shingle_size'] = shingle_size
+
+
+def _process_document(key: str) -> Dict[str, Any]:
+    """
+    Read, extract, normalize and sign a single document (runs in a worker).
+
+    Args:
+        key: S3 object key or local file path.
+
+    Returns:
+        Dict with key, size, tokens, content hash and MinHash signature.
+        Signature is None if the text could not be extracted. If the
+        document could not be read or parsed, only ``key`` and ``error``
+        are set.
+    """
+    try:
+        bucket = _worker_state['bucket']
+        if bucket is None:
+            data = Path(key).read_bytes()
+        else:
+            data = _worker_state['s3'].get_object(Bucket=bucket, Key=key)['Body'].read()
+        text = extract_text(data, key)
+    except Exception as e:
+        return {'key': key, 'error': f"{type(e).__name__}: {e}"}
+
+    record: Dict[str, Any] = {
+        'key': key,
+        'size': len(data),
+        'tokens': 0,
+        'content_hash': hashlib.sha256(data).hexdigest(),
+        'signature': None
+    }
+
+    if text is None:
+        return record
+
+    normalized = normalize_text(text)
+    record['tokens'] = estimate_tokens(text)
+    record['content_hash'] = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    record['signature'] = _worker_state['hasher'].signature(
+        shingles(normalized, _worker_state['shingle_size'])
+    )
+    return record
+
+
+def bounded_map(
+    executor: Executor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_in_flight: int
+) -> Iterator[Any]:
+    """
+    Map a function over a stream without materializing it.
+
+    ``Executor.map`` submits the whole iterable up front; this keeps at
+    most ``max_in_flight`` tasks pending so very large listings stream.
+
+    Args:
+        executor: Executor to submit work to.
+        fn: Function to apply.
+        items: Input iterable (consumed lazily).
+        max_in_flight: Maximum number of pending futures.
+
+    Yields:
+        Results in submission order, so downstream decisions do not
+        depend on worker timing.
+    """
+    pending: Deque[Future] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+class CorpusPreprocessor:
+    """Parallel near-duplicate elimination and upload pipeline."""
+
+    def __init__(
+        self,
+        source: str,
+        destination: str,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 5,
+        workers: Optional[int] = None,
+        upload_threads: int = 16,
+        merge: bool = False,
+        profile_name: Optional[str] = None,
+        region_name: Optional[str] = None
+    ) -> None:
+        """
+        Initialize the preprocessing pipeline.
+
+        Args:
+            source: ``s3://bucket/prefix`` URI or local directory to read.
+            destination: ``s3://bucket/prefix`` URI of the KB data bucket.
+            threshold: Estimated Jaccard similarity above which documents
+                are considered near-duplicates.
+            num_perm: MinHash signature length.
+            bands: Number of LSH bands.
+            shingle_size: Words per shingle.
+            workers: Process pool size (defaults to CPU count).
+            upload_threads: Number of concurrent uploads.
+            merge: Keep duplicates' keys in a ``.metadata.json`` sidecar of
+                the surviving document instead of dropping them silently.
+            profile_name: AWS profile name.
+            region_name: AWS region name.
+        """
+        self.source = source
+        self.destination = destination
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.workers = workers or os.cpu_count() or 1
+        self.upload_threads = upload_threads
+        self.merge = merge
+        self.profile_name = profile_name or config.AWS_PROFILE
+        self.region_name = region_name or config.AWS_REGION
+        self.sidecars: Set[str] = set()
+
+        session = boto3.Session(profile_name=self.profile_name, region_name=self.region_name)
+        self.s3 = session.client('s3')
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=4
+        )
+
+    def deduplicate(self) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]], Dict[str, Any]]:
+        """
+        Stream the corpus through the process pool and the LSH index.
+
+        Documents are processed in listing order and the first document
+        of each near-duplicate cluster survives, so reruns keep the same
+        copy.
+
+        Returns:
+            Tuple of (survivors, duplicates_by_survivor_key, stats).
+        """
+        source_bucket, _ = parse_location(self.source)
+        index = LSHIndex(self.num_perm, self.bands)
+        exact: Dict[str, str] = {}
+        survivors: List[Dict[str, Any]] = []
+        duplicates: Dict[str, List[str]] = {}
+        stats = {
+            'documents': 0, 'duplicates': 0, 'unsupported': 0, 'failed': 0,
+            'tokens_total': 0, 'tokens_saved': 0,
+            'chunks_total': 0, 'chunks_saved': 0
+        }
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(source_bucket, self.profile_name, self.region_name,
+                      self.num_perm, self.shingle_size)
+        ) as executor:
+            keys = iter_source_keys(
+                self.source, self.profile_name, self.region_name, self.sidecars
+            )
+            for record in bounded_map(executor, _process_document, keys, self.workers * 4):
+                stats['documents'] += 1
+                if 'error' in record:
+                    stats['failed'] += 1
+                    print(f"⚠️  Skipping {record['key']}: {record['error']}")
+                    continue
+
+                chunks = estimate_chunks(record['tokens'])
+                stats['tokens_total'] += record['tokens']
+                stats['chunks_total'] += chunks
+
+                signature = record['signature']
+                if signature is None:
+                    stats['unsupported'] += 1
+
+                match = exact.get(record['content_hash'])
+                if match is None and signature is not None:
+                    found = index.query(signature, self.threshold)
+                    match = found[0] if found else None
+
+                if match is not None:
+                    duplicates.setdefault(match, []).append(record['key'])
+                    stats['duplicates'] += 1
+                    stats['tokens_saved'] += record['tokens']
+                    stats['chunks_saved'] += chunks
+                    continue
+
+                exact[record['content_hash']] = record['key']
+                if signature is not None:
+                    index.insert(record['key'], signature)
+                survivors.append(record)
+
+        return survivors, duplicates, stats
+
+    def _destination_key(self, key: str) -> str:
+        source_bucket, source_prefix = parse_location(self.source)
+        _, dest_prefix = parse_location(self.destination)
+
+        if source_bucket is None:
+            relative = os.path.relpath(key, source_prefix).replace(os.sep, '/')
+        else:
+            prefix = directory_prefix(source_prefix)
+            relative = key[len(prefix):] if key.startswith(prefix) else key
+
+        return f"{directory_prefix(dest_prefix)}{relative}"
+
+    def _read_sidecar(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load the source ``.metadata.json`` sidecar of a document, if any."""
+        sidecar_key = key + METADATA_SUFFIX
+        if sidecar_key not in self.sidecars:
+            return None
+
+        source_bucket, _ = parse_location(self.source)
+        if source_bucket is None:
+            return json.loads(Path(sidecar_key).read_text(encoding='utf-8'))
+        try:
+            body = self.s3.get_object(Bucket=source_bucket, Key=sidecar_key)['Body'].read()
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                return None
+            raise
+        return json.loads(body)
+
+    def _upload(self, record: Dict[str, Any], duplicate_keys: List[str]) -> str:
+        source_bucket, _ = parse_location(self.source)
+        dest_bucket, _ = parse_location(self.destination)
+        dest_key = self._destination_key(record['key'])
+
+        if source_bucket is None:
+            self.s3.upload_file(record['key'], dest_bucket, dest_key, Config=self.transfer_config)
+        else:
+            self.s3.copy(
+                {'Bucket': source_bucket, 'Key': record['key']},
+                dest_bucket, dest_key, Config=self.transfer_config
+            )
+
+        sidecar = self._read_sidecar(record['key'])
+        if self.merge and duplicate_keys:
+            sidecar = sidecar or {}
+            attributes = sidecar.setdefault('metadataAttributes', {})
+            sources = list(attributes.get('duplicate_sources', []))
+            sources += [key for key in duplicate_keys if key not in sources]
+            attributes['duplicate_sources'] = sources[:MAX_DUPLICATE_SOURCES]
+
+        if sidecar is not None:
+            self.s3.put_object(
+                Bucket=dest_bucket,
+                Key=f"{dest_key}.metadata.json",
+                Body=json.dumps(sidecar).encode('utf-8')
+            )
+        return dest_key
+
+    def upload(
+        self,
+        survivors: List[Dict[str, Any]],
+        duplicates: Dict[str, List[str]]
+    ) -> int:
+        """
+        Upload surviving documents concurrently.
+
+        Args:
+            survivors: Records returned by ``deduplicate``.
+            duplicates: Duplicate keys grouped by surviving key.
+
+        Returns:
+            Number of uploaded documents.
+        """
+        with ThreadPoolExecutor(max_workers=self.upload_threads) as executor:
+            futures = [
+                executor.submit(self._upload, record, duplicates.get(record['key'], []))
+                for record in survivors
+            ]
+            for future in futures:
+                future.result()
+        return len(futures)
+
+    def run(self, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Run deduplication and (unless dry_run) upload.
+
+        Args:
+            dry_run: Only report, do not upload anything.
+
+        Returns:
+            Dict with pipeline statistics.
+        """
+        start = time.time()
+        survivors, duplicates, stats = self.deduplicate()
+        stats['dedup_seconds'] = round(time.time() - start, 2)
+        stats['survivors'] = len(survivors)
+
+        if not dry_run:
+            start = time.time()
+            stats['uploaded'] = self.upload(survivors, duplicates)
+            stats['upload_seconds'] = round(time.time() - start, 2)
+
+        return stats
+
+
+def print_report(stats: Dict[str, Any]) -> None:
+    """
+    Print pipeline statistics.
+
+    Args:
+        stats: Dict returned by ``CorpusPreprocessor.run``.
+    """
+    def pct(part: int, whole: int) -> str:
+        return f"{100 * part / whole:.1f}%" if whole else "0.0%"
+
+    print("=" * 70)
+    print("Corpus Preprocessing Report")
+    print("=" * 70)
+    print(f"Documents scanned:    {stats['documents']}")
+    print(f"Near-duplicates:      {stats['duplicates']} ({pct(stats['duplicates'], stats['documents'])})")
+    print(f"Unsupported formats:  {stats['unsupported']} (exact-hash dedup only)")
+    print(f"Failed to read:       {stats['failed']} (not uploaded)")
+    print(f"Surviving documents:  {stats['survivors']}")
+    print(f"Tokens saved:         ~{stats['tokens_saved']} of ~{stats['tokens_total']} "
+          f"({pct(stats['tokens_saved'], stats['tokens_total'])})")
+    print(f"Chunks saved:         ~{stats['chunks_saved']} of ~{stats['chunks_total']} "
+          f"({pct(stats['chunks_saved'], stats['chunks_total'])})")
+    print(f"Dedup time:           {stats['dedup_seconds']}s")
+    if 'uploaded' in stats:
+        print(f"Uploaded:             {stats['uploaded']} in {stats['upload_seconds']}s")
+
+
+def main() -> None:
+    """Main function for CLI usage."""
+    parser = argparse.ArgumentParser(
+        description="Deduplicate and upload a corpus to the Knowledge Base bucket"
+    )
+    parser.add_argument('source', help='s3://bucket/prefix or local directory')
+    parser.add_argument('destination', help='s3://bucket/prefix of the KB data bucket')
+    parser.add_argument('--threshold', type=float, default=0.85,
+                        help='Jaccard similarity for near-duplicates (default: 0.85)')
+    parser.add_argument('--num-perm', type=int, default=128, help='MinHash permutations')
+    parser.add_argument('--bands', type=int, default=32, help='LSH bands')
+    parser.add_argument('--workers', type=int, help='Process pool size')
+    parser.add_argument('--upload-threads', type=int, default=16, help='Concurrent uploads')
+    parser.add_argument('--merge', action='store_true',
+                        help='Record duplicate sources in .metadata.json sidecars')
+    parser.add_argument('--dry-run', action='store_true', help='Report only, do not upload')
+    parser.add_argument('--profile', help='AWS profile name (overrides config)')
+    parser.add_argument('--region', help='AWS region (overrides config)')
+    args = parser.parse_args()
+
+    preprocessor = CorpusPreprocessor(
+        args.source,
+        args.destination,
+        threshold=args.threshold,
+        num_perm=args.num_perm,
+        bands=args.bands,
+        workers=args.workers,
+        upload_threads=args.upload_threads,
+        merge=args.merge,
+        profile_name=args.profile,
+        region_name=args.region
+    )
+    print_report(preprocessor.run(dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
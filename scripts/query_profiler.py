@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Vector Query Profiling
+
+This module turns OpenSearch ``profile: true`` search responses and index
+search statistics into readable reports, and groups a captured query log
+by query shape to find the slowest kinds of k-NN/hybrid queries.
+
+It works on plain response dicts, so reports can be produced from
+recorded responses as well as from a live cluster (see
+``OpenSearchManager.profile_query``).
+"""
+
+import json
+import statistics
+from typing import Any, Dict, Iterable, List
+
+
+NANOS_PER_MS = 1_000_000
+
+# Numeric parameters that change how a query executes, kept literal in shapes
+STRUCTURAL_PARAMETERS = ('k', 'size', 'from', 'num_candidates', 'ef_search')
+
+SEARCH_STAT_FIELDS = (
+    'query_total',
+    'query_time_in_millis',
+    'fetch_total',
+    'fetch_time_in_millis'
+)
+
+
+def _ms(nanos: float) -> float:
+    return round(nanos / NANOS_PER_MS, 3)
+
+
+def _flatten_query_tree(
+    nodes: List[Dict[str, Any]],
+    depth: int = 0
+) -> Iterable[Dict[str, Any]]:
+    for node in nodes:
+        yield {
+            'depth': depth,
+            'type': node.get('type'),
+            'description': node.get('description', '')[:120],
+            'time_ms': _ms(node.get('time_in_nanos', 0))
+        }
+        yield from _flatten_query_tree(node.get('children', []), depth + 1)
+
+
+def parse_profile(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse a profiled search response into per-shard, per-phase timings.
+
+    Args:
+        response: Search response of a query run with ``profile: true``.
+
+    Returns:
+        Dict with ``took_ms``, ``hits`` and a ``shards`` list. Each shard
+        has query/rewrite/collector times, the query phase breakdown
+        (create_weight, build_scorer, next_doc, score, ...) and the
+        flattened query tree.
+    """
+    shards = []
+    for shard in response.get('profile', {}).get('shards', []):
+        query_nanos = rewrite_nanos = collector_nanos = 0
+        breakdown: Dict[str, float] = {}
+        tree: List[Dict[str, Any]] = []
+
+        for search in shard.get('searches', []):
+            rewrite_nanos += search.get('rewrite_time', 0)
+            collector_nanos += sum(c.get('time_in_nanos', 0) for c in search.get('collector', []))
+
+            # Top-level nodes already include their children's time
+            for node in search.get('query', []):
+                query_nanos += node.get('time_in_nanos', 0)
+                for phase, nanos in node.get('breakdown', {}).items():
+                    if not phase.endswith('_count'):
+                        breakdown[phase] = breakdown.get(phase, 0) + nanos
+            tree.extend(_flatten_query_tree(search.get('query', [])))
+
+        aggregation_nanos = sum(a.get('time_in_nanos', 0) for a in shard.get('aggregations', []))
+        fetch_nanos = shard.get('fetch', {}).get('time_in_nanos', 0)
+
+        shards.append({
+            'id': shard.get('id'),
+            'query_ms': _ms(query_nanos),
+            'rewrite_ms': _ms(rewrite_nanos),
+            'collector_ms': _ms(collector_nanos),
+            'aggregation_ms': _ms(aggregation_nanos),
+            'fetch_ms': _ms(fetch_nanos),
+            'breakdown_ms': {
+                phase: _ms(nanos)
+                for phase, nanos in sorted(breakdown.items(), key=lambda item: -item[1])
+                if nanos
+            },
+            'query_tree': tree
+        })
+
+    shards.sort(key=lambda s: s['query_ms'] + s['collector_ms'], reverse=True)
+    hits = response.get('hits', {}).get('total', 0)
+    return {
+        'took_ms': response.get('took'),
+        'hits': hits.get('value', 0) if isinstance(hits, dict) else hits,
+        'shards': shards
+    }
+
+
+def format_profile_report(report: Dict[str, Any]) -> str:
+    """
+    Format a parsed profile as readable text.
+
+    Args:
+        report: Result of ``parse_profile``.
+
+    Returns:
+        Multi-line report, slowest shard first.
+    """
+    lines = [
+        "=" * 70,
+        f"Query profile: took {report['took_ms']} ms, {report['hits']} hits, "
+        f"{len(report['shards'])} shard(s)",
+        "=" * 70
+    ]
+    for shard in report['shards']:
+        lines.append(f"\nShard {shard['id']}")
+        lines.append(
+            f"  query {shard['query_ms']} ms | rewrite {shard['rewrite_ms']} ms | "
+            f"collect {shard['collector_ms']} ms | aggs {shard['aggregation_ms']} ms | "
+            f"fetch {shard['fetch_ms']} ms"
+        )
+        for phase, ms in shard['breakdown_ms'].items():
+            lines.append(f"    {phase:<28}{ms:>10.3f} ms")
+        lines.append("  Query tree:")
+        for node in shard['query_tree']:
+            indent = "  " * node['depth']
+            lines.append(f"    {indent}{node['type']} {node['time_ms']} ms  {node['description']}")
+    return '\n'.join(lines)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def query_shape(body: Any) -> str:
+    """
+    Reduce a query body to its shape.
+
+    Keys, structure and structural numeric parameters (``k``, ``size``,
+    ``from``, ``num_candidates``, ``ef_search``) are kept; other scalar
+    values become their type name and vectors become ``<vector[n]>``, so
+    queries that differ only in their text or embedding map to the same
+    shape while a different ``k`` is a different shape.
+
+    Args:
+        body: Query body (dict) or any nested value.
+
+    Returns:
+        Canonical JSON string describing the shape.
+    """
+    def reduce(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                key: item if key in STRUCTURAL_PARAMETERS and _is_number(item) else reduce(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            if value and all(isinstance(item, (int, float)) for item in value):
+                return f"<vector[{len(value)}]>"
+            return [reduce(item) for item in value]
+        if isinstance(value, bool):
+            return "<bool>"
+        if isinstance(value, (int, float)):
+            return "<number>"
+        if value is None:
+            return None
+        return "<string>"
+
+    return json.dumps(reduce(body), sort_keys=True)
+
+
+def rank_query_shapes(samples: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate replayed query timings by shape, slowest first.
+
+    Args:
+        samples: Dicts with ``shape`` and ``took_ms``.
+
+    Returns:
+        One dict per shape with count, mean, p50, p95 and max latency,
+        sorted by p95 descending.
+    """
+    by_shape: Dict[str, List[float]] = {}
+    for sample in samples:
+        by_shape.setdefault(sample['shape'], []).append(sample['took_ms'])
+
+    ranking = []
+    for shape, timings in by_shape.items():
+        timings.sort()
+        ranking.append({
+            'shape': shape,
+            'count': len(timings),
+            'mean_ms': round(statistics.mean(timings), 2),
+            'p50_ms': timings[len(timings) // 2],
+            'p95_ms': timings[min(int(len(timings) * 0.95), len(timings) - 1)],
+            'max_ms': timings[-1]
+        })
+
+    ranking.sort(key=lambda entry: (entry['p95_ms'], entry['mean_ms']), reverse=True)
+    return ranking
+
+
+def search_stats_delta(
+    before: Dict[str, Any],
+    after: Dict[str, Any],
+    index_name: str,
+    window_seconds: float
+) -> Dict[str, Any]:
+    """
+    Compute search rates and latencies between two index stats samples.
+
+    Args:
+        before: ``indices.stats(metric='search')`` response at window start.
+        after: Same response at window end.
+        index_name: Index to report on.
+        window_seconds: Time between the two samples.
+
+    Returns:
+        Dict with query/fetch counts, rates per second and average
+        latencies over the window.
+    """
+    def totals(response: Dict[str, Any]) -> Dict[str, int]:
+        search = response['indices'][index_name]['total']['search']
+        return {field: search.get(field, 0) for field in SEARCH_STAT_FIELDS}
+
+    start, end = totals(before), totals(after)
+    delta = {field: end[field] - start[field] for field in SEARCH_STAT_FIELDS}
+
+    def average(time_field: str, count_field: str) -> float:
+        return round(delta[time_field] / delta[count_field], 2) if delta[count_field] else 0.0
+
+    return {
+        'index': index_name,
+        'window_seconds': window_seconds,
+        'queries': delta['query_total'],
+        'queries_per_second': round(delta['query_total'] / window_seconds, 2) if window_seconds else 0.0,
+        'avg_query_ms': average('query_time_in_millis', 'query_total'),
+        'fetches': delta['fetch_total'],
+        'avg_fetch_ms': average('fetch_time_in_millis', 'fetch_total')
+    }
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Sharded Knowledge Base Ingestion
+
+This module runs ingestion jobs for several prefix-based data sources
+(shards) of the same Knowledge Base in parallel. A single backoff
+scheduler starts jobs within the concurrency limit, polls all running
+jobs, prints one combined progress view and retries only failed shards.
+
+Shards are declared in Terraform with ``ingestion_shard_prefixes``; each
+prefix becomes a data source named ``<kb_name>-shard-<prefix>``.
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+from .bedrock_client import BedrockClient
+from .config import config
+
+
+SHARD_NAME_MARKER = "-shard-"
+
+STATISTIC_FIELDS = (
+    'numberOfDocumentsScanned',
+    'numberOfNewDocumentsIndexed',
+    'numberOfModifiedDocumentsIndexed',
+    'numberOfDocumentsDeleted',
+    'numberOfDocumentsFailed'
+)
+
+# Job states that still hold a concurrency slot
+ACTIVE_STATUSES = ('STARTING', 'IN_PROGRESS', 'STOPPING')
+
+# Errors that mean "try again later" when starting a job
+RETRYABLE_START_ERRORS = ('ThrottlingException', 'ConflictException', 'ServiceQuotaExceededException')
+
+
+def discover_shards(client: BedrockClient, kb_id: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Find shard data sources of a Knowledge Base.
+
+    Args:
+        client: Initialized BedrockClient instance.
+        kb_id: Knowledge Base ID (uses config if not provided).
+
+    Returns:
+        List of dicts with ``data_source_id`` and ``name``.
+    """
+    return [
+        {'data_source_id': summary['dataSourceId'], 'name': summary['name']}
+        for summary in client.list_data_sources(kb_id)
+        if SHARD_NAME_MARKER in summary['name']
+    ]
+
+
+def plan_prefixes(
+    bucket: str,
+    profile_name: Optional[str] = None,
+    region_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Summarize top-level prefixes of the data bucket as shard candidates.
+
+    Args:
+        bucket: S3 bucket name.
+        profile_name: AWS profile name.
+        region_name: AWS region name.
+
+    Returns:
+        List of dicts with ``prefix``, ``objects`` and ``bytes``, largest first.
+    """
+    session = boto3.Session(
+        profile_name=profile_name or config.AWS_PROFILE,
+        region_name=region_name or config.AWS_REGION
+    )
+    paginator = session.client('s3').get_paginator('list_objects_v2')
+
+    totals: Dict[str, Dict[str, Any]] = {}
+    for page in paginator.paginate(Bucket=bucket):
+        for obj in page.get('Contents', []):
+            head, sep, _ = obj['Key'].partition('/')
+            prefix = head + sep if sep else ''
+            entry = totals.setdefault(prefix, {'prefix': prefix, 'objects': 0, 'bytes': 0})
+            entry['objects'] += 1
+            entry['bytes'] += obj['Size']
+
+    return sorted(totals.values(), key=lambda entry: entry['bytes'], reverse=True)
+
+
+class IngestionScheduler:
+    """Starts and polls ingestion jobs for many shards with one backoff loop."""
+
+    def __init__(
+        self,
+        client: BedrockClient,
+        kb_id: Optional[str] = None,
+        max_concurrent: int = 5,
+        max_retries: int = 2,
+        min_interval: float = 5.0,
+        max_interval: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+        output: Any = sys.stdout
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            client: Initialized BedrockClient instance.
+            kb_id: Knowledge Base ID (uses config if not provided).
+            max_concurrent: Maximum jobs running at once. Bedrock enforces
+                account and per-KB quotas; the effective limit is lowered
+                when a start is rejected for quota reasons and raised by
+                one again each time a job finishes.
+            max_retries: Number of times a failed shard is retried.
+            min_interval: Initial polling interval in seconds.
+            max_interval: Maximum polling interval in seconds.
+            sleep: Sleep function (injectable for tests).
+            clock: Clock function (injectable for tests).
+            output: Stream for the progress view.
+        """
+        self.client = client
+        self.kb_id = kb_id or config.KNOWLEDGE_BASE_ID
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.sleep = sleep
+        self.clock = clock
+        self.output = output
+
+    def _start(self, shard: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Start a shard job; return (job ID, None) or (None, retryable error code)."""
+        try:
+            job = self.client.start_ingestion_job(self.kb_id, shard['data_source_id'])
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code in RETRYABLE_START_ERRORS:
+                return None, code
+            raise
+        return job['ingestionJobId'], None
+
+    def _poll(self, shard: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch job details; return None if throttled."""
+        try:
+            return self.client.get_ingestion_job(
+                shard['job_id'], self.kb_id, shard['data_source_id']
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ThrottlingException':
+                return None
+            raise
+
+    def _print_progress(self, shards: List[Dict[str, Any]], started: float) -> None:
+        totals = aggregate_statistics(shards)
+        elapsed = max(self.clock() - started, 1e-9)
+        counts: Dict[str, int] = {}
+        for shard in shards:
+            counts[shard['status']] = counts.get(shard['status'], 0) + 1
+        status = ', '.join(f"{name.lower()}={count}" for name, count in sorted(counts.items()))
+        indexed = totals['numberOfNewDocumentsIndexed'] + totals['numberOfModifiedDocumentsIndexed']
+
+        print(
+            f"[{elapsed:7.0f}s] shards: {status} | scanned {totals['numberOfDocumentsScanned']} "
+            f"| indexed {indexed} | failed {totals['numberOfDocumentsFailed']} "
+            f"| {totals['numberOfDocumentsScanned'] / elapsed:.1f} docs/s",
+            file=self.output,
+            flush=True
+        )
+
+    def run(self, shards: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Ingest all shards and wait for completion.
+
+        Args:
+            shards: List of dicts with ``data_source_id`` and ``name``.
+
+        Returns:
+            Per-shard dicts with final ``status``, ``statistics``,
+            ``attempts`` and ``failure_reasons``.
+        """
+        states = [
+            dict(shard, status='QUEUED', job_id=None, attempts=0,
+                 statistics={}, failure_reasons=[])
+            for shard in shards
+        ]
+        limit = self.max_concurrent
+        interval = self.min_interval
+        started = self.clock()
+
+        while True:
+            running = [s for s in states if s['status'] in ACTIVE_STATUSES]
+            queued = [s for s in states if s['status'] == 'QUEUED']
+            if not running and not queued:
+                break
+
+            throttled = False
+            changed = False
+
+            for shard in queued[:max(limit - len(running), 0)]:
+                job_id, error = self._start(shard)
+                if job_id is None:
+                    if error != 'ThrottlingException':
+                        # Quota or conflict: hold the limit at what is already running
+                        limit = max(len(running), 1)
+                    throttled = True
+                    break
+                shard.update(status='STARTING', job_id=job_id, statistics={})
+                shard['attempts'] += 1
+                running.append(shard)
+                changed = True
+
+            for shard in running:
+                job = self._poll(shard)
+                if job is None:
+                    throttled = True
+                    continue
+
+                shard['statistics'] = job.get('statistics', {})
+                status = job['status']
+                if status in ('FAILED', 'STOPPED'):
+                    shard['failure_reasons'] = job.get('failureReasons', [])
+                    status = 'QUEUED' if shard['attempts'] <= self.max_retries else status
+                if status != shard['status']:
+                    shard['status'] = status
+                    changed = True
+                if status not in ACTIVE_STATUSES:
+                    # A finished job frees a slot; recover from an earlier quota rejection
+                    limit = min(limit + 1, self.max_concurrent)
+
+            self._print_progress(states, started)
+
+            if throttled:
+                interval = min(interval * 2, self.max_interval)
+            elif changed:
+                interval = self.min_interval
+            else:
+                interval = min(interval * 1.5, self.max_interval)
+
+            if any(s['status'] in ACTIVE_STATUSES + ('QUEUED',) for s in states):
+                self.sleep(interval * random.uniform(0.8, 1.2))
+
+        return states
+
+
+def aggregate_statistics(shards: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Sum ingestion statistics across shards.
+
+    Args:
+        shards: Shard states with a ``statistics`` dict.
+
+    Returns:
+        Dict of summed statistic fields.
+    """
+    return {
+        field: sum(shard['statistics'].get(field, 0) for shard in shards)
+        for field in STATISTIC_FIELDS
+    }
+
+
+def main() -> None:
+    """Main function for CLI usage."""
+    parser = argparse.ArgumentParser(description="Sharded parallel Knowledge Base ingestion")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    plan_parser = subparsers.add_parser('plan', help='Show prefix sizes of the data bucket')
+    plan_parser.add_argument('bucket', help='KB data bucket name')
+
+    subparsers.add_parser('list', help='List shard data sources')
+
+    sync_parser = subparsers.add_parser('sync', help='Ingest all (or selected) shards')
+    sync_parser.add_argument('--data-source-ids', nargs='+',
+                             help='Only ingest these data sources (e.g. retry failed shards)')
+    sync_parser.add_argument('--max-concurrent', type=int, default=5)
+    sync_parser.add_argument('--max-retries', type=int, default=2)
+
+    parser.add_argument('--kb-id', help='Knowledge Base ID (overrides config)')
+    parser.add_argument('--profile', help='AWS profile name (overrides config)')
+    parser.add_argument('--region', help='AWS region (overrides config)')
+    args = parser.parse_args()
+
+    if args.command == 'plan':
+        prefixes = plan_prefixes(args.bucket, args.profile, args.region)
+        for entry in prefixes:
+            print(f"{entry['prefix'] or '(root)':<40}{entry['objects']:>10} objects"
+                  f"{entry['bytes'] / 1024 / 1024:>12.1f} MB")
+        shard_prefixes = ', '.join(f'"{e["prefix"]}"' for e in prefixes if e['prefix'])
+        print(f"\ningestion_shard_prefixes = [{shard_prefixes}]")
+        root = next((e for e in prefixes if not e['prefix']), None)
+        if root:
+            print(f"\n⚠️  {root['objects']} object(s) at the bucket root are not covered by any "
+                  f"shard and will not be ingested. Move them under a prefix first.")
+        return
+
+    client = BedrockClient(profile_name=args.profile, region_name=args.region)
+    shards = discover_shards(client, args.kb_id)
+
+    if args.command == 'list':
+        for shard in shards:
+            print(f"{shard['data_source_id']}  {shard['name']}")
+        return
+
+    if args.data_source_ids:
+        shards = [s for s in shards if s['data_source_id'] in args.data_source_ids]
+    if not shards:
+        print("❌ Error: No shard data sources found. Set ingestion_shard_prefixes in Terraform.")
+        sys.exit(1)
+
+    scheduler = IngestionScheduler(
+        client, args.kb_id,
+        max_concurrent=args.max_concurrent,
+        max_retries=args.max_retries
+    )
+    results = scheduler.run(shards)
+
+    print("\n" + "=" * 70)
+    failed = []
+    for shard in results:
+        stats = shard['statistics']
+        print(f"{shard['status']:<10} {shard['name']:<40} attempts={shard['attempts']} "
+              f"scanned={stats.get('numberOfDocumentsScanned', 0)} "
+              f"failed={stats.get('numberOfDocumentsFailed', 0)}")
+        if shard['status'] != 'COMPLETE':
+            failed.append(shard)
+            for reason in shard['failure_reasons']:
+                print(f"           {reason}")
+
+    if failed:
+        ids = ' '.join(s['data_source_id'] for s in failed)
+        print(f"\n❌ {len(failed)} shard(s) failed. Retry with:")
+        print(f"   python -m scripts.sharded_ingestion sync --data-source-ids {ids}")
+        sys.exit(1)
+    print("\n✅ All shards ingested successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,33 @@ resource "aws_bedrockagent_knowledge_base" "kb" {
   name     = var.kb_name
   role_arn = var.kb_role_arn
 
+  # Cross-variable checks; variable validation blocks cannot see other variables
+  lifecycle {
+    precondition {
+      condition     = !can(regex("titan-embed-text-v2", var.embedding_model_arn)) || var.embedding_dimension != 1536
+      error_message = "Titan v2 supports embedding_dimension 256, 512 or 1024, not 1536."
+    }
+    precondition {
+      condition     = can(regex("titan-embed-text-v2", var.embedding_model_arn)) || (var.embedding_dimension == 1536 && var.embedding_data_type == "float")
+      error_message = "Titan v1 only produces 1536-dimension float embeddings; use a Titan v2 ARN for other settings."
+    }
+  }
+
   knowledge_base_configuration {
     type = "VECTOR"
     vector_knowledge_base_configuration {
       embedding_model_arn = var.embedding_model_arn
+
+      # Titan v2 only: output size and type must match the OpenSearch index
+      dynamic "embedding_model_configuration" {
+        for_each = can(regex("titan-embed-text-v2", var.embedding_model_arn)) ? [1] : []
+        content {
+          bedrock_embedding_model_configuration {
+            dimensions          = var.embedding_dimension
+            embedding_data_type = upper(var.embedding_data_type)
+          }
+        }
+      }
     }
   }
 
@@ -23,7 +46,10 @@ resource "aws_bedrockagent_knowledge_base" "kb" {
   }
 }
 
+# Whole-bucket data source, replaced by the shard data sources when
+# ingestion_shard_prefixes is set (otherwise documents are indexed twice)
 resource "aws_bedrockagent_data_source" "kb_data_source" {
+  count             = length(var.ingestion_shard_prefixes) == 0 ? 1 : 0
   name              = "${var.kb_name}-datasource"
   knowledge_base_id = aws_bedrockagent_knowledge_base.kb.id
 
@@ -49,3 +75,39 @@ resource "aws_bedrockagent_data_source" "kb_data_source" {
     }
   }
 }
+
+moved {
+  from = aws_bedrockagent_data_source.kb_data_source
+  to   = aws_bedrockagent_data_source.kb_data_source[0]
+}
+
+# Optional prefix shards for parallel ingestion (scripts/sharded_ingestion.py).
+# Each prefix gets its own data source so ingestion jobs can run concurrently.
+resource "aws_bedrockagent_data_source" "kb_shard" {
+  for_each          = toset(var.ingestion_shard_prefixes)
+  name              = "${var.kb_name}-shard-${trim(replace(each.value, "/[^a-zA-Z0-9]+/", "-"), "-")}"
+  knowledge_base_id = aws_bedrockagent_knowledge_base.kb.id
+
+  data_source_configuration {
+    type = "S3"
+    s3_configuration {
+      bucket_arn         = aws_s3_bucket.kb_data.arn
+      inclusion_prefixes = [each.value]
+    }
+  }
+
+  vector_ingestion_configuration {
+    chunking_configuration {
+      chunking_strategy = "HIERARCHICAL"
+      hierarchical_chunking_configuration {
+        level_configuration {
+          max_tokens = 1500
+        }
+        level_configuration {
+          max_tokens = 300
+        }
+        overlap_tokens = 60
+      }
+    }
+  }
+}
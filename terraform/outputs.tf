@@ -7,7 +7,12 @@ output "knowledge_base_arn" {
 }
 
 output "data_source_id" {
-  value = aws_bedrockagent_data_source.kb_data_source.id
+  # null when the bucket is split into shard data sources
+  value = one(aws_bedrockagent_data_source.kb_data_source[*].id)
+}
+
+output "shard_data_source_ids" {
+  value = { for prefix, ds in aws_bedrockagent_data_source.kb_shard : prefix => ds.data_source_id }
 }
 
 output "s3_bucket_name" {
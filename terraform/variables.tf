@@ -10,6 +10,32 @@ variable "embedding_model_arn" {
   default = "arn:aws:bedrock:us-east-1::foundation-model/amazon.titan-embed-text-v1"
 }
 
+variable "embedding_dimension" {
+  description = "Embedding size: 1536 for Titan v1, 256/512/1024 for Titan v2"
+  default     = 1536
+
+  validation {
+    condition     = contains([256, 512, 1024, 1536], var.embedding_dimension)
+    error_message = "embedding_dimension must be 1536 (Titan v1) or 256, 512 or 1024 (Titan v2)."
+  }
+}
+
+variable "embedding_data_type" {
+  description = "Embedding type for Titan v2: float or binary"
+  default     = "float"
+
+  validation {
+    condition     = contains(["float", "binary"], var.embedding_data_type)
+    error_message = "embedding_data_type must be \"float\" or \"binary\"."
+  }
+}
+
+variable "ingestion_shard_prefixes" {
+  description = "S3 prefixes that each get their own data source for parallel ingestion"
+  type        = list(string)
+  default     = []
+}
+
 variable "kb_role_arn" {
   default = "arn:aws:iam::253223147282:role/AmazonBedRockAgentCoreRole-PPD"
 }
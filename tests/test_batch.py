@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test the concurrent, resumable batch runner.
+
+This script drives BatchRunner with an in-memory stand-in for
+BedrockClient to check resume, retry and crash recovery of the answers
+file.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.batch_runner import BatchRunner
+
+
+QUESTIONS = [
+    {'id': 'q1', 'question': "What is Amazon Bedrock?"},
+    {'id': 'q2', 'question': "How does hierarchical chunking work?"},
+    {'id': 'q3', 'question': "Which vector engine is used?"}
+]
+
+
+class FakeBedrockClient:
+    """Stand-in for BedrockClient that fails selected questions once."""
+
+    def __init__(self, fail_once=()) -> None:
+        self.fail_once = set(fail_once)
+        self.asked: List[str] = []
+        self.lock = threading.Lock()
+
+    def invoke_agent(self, query: str, session_id: str = "default-session") -> str:
+        with self.lock:
+            self.asked.append(query)
+            if query in self.fail_once:
+                self.fail_once.discard(query)
+                raise RuntimeError("ThrottlingException")
+        return f"answer to {query}"
+
+
+def write_questions(directory: Path) -> Path:
+    """Write the question set to a JSONL file."""
+    path = directory / "questions.jsonl"
+    path.write_text(''.join(json.dumps(q) + '\n' for q in QUESTIONS), encoding='utf-8')
+    return path
+
+
+def read_records(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read an answers file, failing on unparsable or repeated ids."""
+    records = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    by_id = {record['id']: record for record in records}
+    assert len(by_id) == len(records), "answers file has more than one record per id"
+    return by_id
+
+
+def test_skips_succeeded_items() -> None:
+    """Test that items already answered are not asked again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        questions = write_questions(Path(tmp))
+        out = Path(tmp) / "answers.jsonl"
+        out.write_text(json.dumps({'id': 'q1', 'status': 'ok', 'answer': 'cached'}) + '\n')
+
+        client = FakeBedrockClient()
+        summary = BatchRunner(client, concurrency=2).run(str(questions), str(out))
+        records = read_records(out)
+
+    assert summary['skipped'] == 1 and summary['processed'] == 2
+    assert QUESTIONS[0]['question'] not in client.asked
+    assert records['q1']['answer'] == 'cached'
+    assert all(record['status'] == 'ok' for record in records.values())
+
+
+def test_retries_failed_items() -> None:
+    """Test that a rerun only retries the failed item and replaces its record."""
+    with tempfile.TemporaryDirectory() as tmp:
+        questions = write_questions(Path(tmp))
+        out = Path(tmp) / "answers.jsonl"
+        client = FakeBedrockClient(fail_once=[QUESTIONS[1]['question']])
+
+        first = BatchRunner(client, concurrency=2).run(str(questions), str(out))
+        assert first['errors'] == 1
+        assert read_records(out)['q2']['status'] == 'error'
+
+        client.asked.clear()
+        second = BatchRunner(client, concurrency=2).run(str(questions), str(out))
+        records = read_records(out)
+
+    assert second['skipped'] == 2 and second['ok'] == 1
+    assert client.asked == [QUESTIONS[1]['question']]
+    assert records['q2']['status'] == 'ok'
+
+
+def test_recovers_half_written_line() -> None:
+    """Test that a line truncated by a crash is dropped and its item rerun."""
+    with tempfile.TemporaryDirectory() as tmp:
+        questions = write_questions(Path(tmp))
+        out = Path(tmp) / "answers.jsonl"
+        out.write_text(json.dumps({'id': 'q1', 'status': 'ok', 'answer': 'cached'}) + '\n'
+                       + '{"id": "q2", "status": "o')
+
+        client = FakeBedrockClient()
+        summary = BatchRunner(client, concurrency=2).run(str(questions), str(out))
+        records = read_records(out)
+
+    assert summary['processed'] == 2
+    assert sorted(records) == ['q1', 'q2', 'q3']
+    assert records['q2']['answer'] == f"answer to {QUESTIONS[1]['question']}"
+
+
+def main() -> None:
+    """Run batch runner tests."""
+    print("=" * 70)
+    print("Testing Resumable Batch Runner")
+    print("=" * 70)
+    print()
+
+    try:
+        test_skips_succeeded_items()
+        test_retries_failed_items()
+        test_recovers_half_written_line()
+
+        print("✅ All tests completed successfully!")
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
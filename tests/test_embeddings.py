@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test low-dimension embedding support.
+
+This script checks the knn_vector mapping, the HNSW memory estimate and
+the offline recall evaluation on a tiny synthetic sample, without
+touching AWS.
+"""
+
+import json
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.embedding_eval import _pack_bits, evaluate_sample, exact_search
+from scripts.opensearch_manager import build_vector_mapping, estimate_vector_memory
+
+
+def test_binary_mapping_uses_hamming() -> None:
+    """Test that binary vectors are mapped with Hamming distance on faiss."""
+    mapping = build_vector_mapping(512, 'binary')
+
+    assert mapping['dimension'] == 512
+    assert mapping['data_type'] == 'binary'
+    assert mapping['method']['space_type'] == 'hamming'
+    assert mapping['method']['engine'] == 'faiss'
+
+    float_mapping = build_vector_mapping(1024, 'float')
+    assert 'data_type' not in float_mapping
+    assert float_mapping['method']['space_type'] == 'l2'
+
+
+def test_invalid_mappings_rejected() -> None:
+    """Test that combinations Titan or the k-NN plugin reject raise ValueError."""
+    invalid = [
+        (768, 'float', 'faiss'),
+        (512, 'int8', 'faiss'),
+        (1536, 'binary', 'faiss'),
+        (512, 'binary', 'nmslib')
+    ]
+    for dimension, data_type, engine in invalid:
+        try:
+            build_vector_mapping(dimension, data_type, engine)
+        except ValueError:
+            continue
+        raise AssertionError(f"{dimension}:{data_type} on {engine} should be rejected")
+
+
+def test_estimate_vector_memory() -> None:
+    """Test the 1.1 * (bytes_per_vector + 8 * m) * n sizing formula."""
+    assert estimate_vector_memory(1000, 1024, 'float', m=16) == int(1.1 * (4096 + 128) * 1000)
+    assert estimate_vector_memory(1000, 1024, 'binary', m=16) == int(1.1 * (128 + 128) * 1000)
+    assert estimate_vector_memory(0, 256, 'float') == 0
+
+
+def test_exact_search() -> None:
+    """Test exact L2 and Hamming scans, including self-exclusion."""
+    float_docs = [
+        (doc_id, (vec, sum(x * x for x in vec)))
+        for doc_id, vec in [('a', [0.0, 0.0]), ('b', [1.0, 0.0]), ('c', [5.0, 5.0])]
+    ]
+    assert exact_search([0.9, 0.1], float_docs, 'float', k=2) == ['b', 'a']
+    assert exact_search([0.0, 0.0], float_docs, 'float', k=1, exclude='a') == ['b']
+
+    binary_docs = [('a', _pack_bits([0, 0, 0, 0])), ('b', _pack_bits([1, 1, 0, 0])),
+                   ('c', _pack_bits([1, 1, 1, 1]))]
+    assert exact_search(_pack_bits([1, 1, 1, 0]), binary_docs, 'binary', k=2) == ['b', 'c']
+
+
+def test_evaluate_sample() -> None:
+    """Test that evaluation scores the reference at full recall on a synthetic sample."""
+    rng = random.Random(3)
+    records = []
+    for i in range(30):
+        vector = [rng.gauss(0, 1) for _ in range(256)]
+        records.append({
+            'id': f'doc-{i}',
+            'kind': 'query' if i % 10 == 0 else 'doc',
+            'embeddings': {
+                '256:float': vector,
+                '256:binary': [1 if x > 0 else 0 for x in vector]
+            }
+        })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sample_path = Path(tmp) / 'sample.jsonl'
+        sample_path.write_text(''.join(json.dumps(r) + '\n' for r in records), encoding='utf-8')
+        report = evaluate_sample(str(sample_path), k=5, corpus_size=1000)
+
+    by_config = {row['config']: row for row in report}
+    assert [row['config'] for row in report] == ['256:float', '256:binary']
+    assert by_config['256:float']['reference']
+    assert by_config['256:float']['recall_at_k'] == 1.0
+    assert 0.0 <= by_config['256:binary']['recall_at_k'] <= 1.0
+    assert by_config['256:binary']['memory_bytes'] < by_config['256:float']['memory_bytes']
+
+
+def main() -> None:
+    """Run embedding tests."""
+    print("=" * 70)
+    print("Testing Low-Dimension Embeddings")
+    print("=" * 70)
+    print()
+
+    try:
+        test_binary_mapping_uses_hamming()
+        test_invalid_mappings_rejected()
+        test_estimate_vector_memory()
+        test_exact_search()
+        test_evaluate_sample()
+
+        print("✅ All tests completed successfully!")
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test MCP load test response classification.
+
+This script checks how server response lines are counted as errors,
+without starting the server.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.mcp_load_test import is_error_response
+
+
+def tool_response(text: str) -> str:
+    """Build a tool result line as written by the MCP server."""
+    return json.dumps({'content': [{'type': 'text', 'text': text}]})
+
+
+def test_error_responses() -> None:
+    """Test that protocol errors, tool errors and partial results count as errors."""
+    assert is_error_response('not json')
+    assert is_error_response('42')
+    assert is_error_response(json.dumps({'error': {'code': -32601}}))
+    assert is_error_response(tool_response("Error: ThrottlingException"))
+    assert is_error_response(tool_response(json.dumps({'partial': True, 'results': []})))
+
+
+def test_successful_responses() -> None:
+    """Test that normal results, including text starting with '{', are not errors."""
+    assert not is_error_response(tool_response("Amazon Bedrock is a managed service."))
+    assert not is_error_response(tool_response(json.dumps({'partial': False, 'results': []})))
+    assert not is_error_response(tool_response("{braces} in a plain answer"))
+
+
+def main() -> None:
+    """Run MCP load test tests."""
+    print("=" * 70)
+    print("Testing MCP Load Test Response Classification")
+    print("=" * 70)
+    print()
+
+    try:
+        test_error_responses()
+        test_successful_responses()
+
+        print("✅ All tests completed successfully!")
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
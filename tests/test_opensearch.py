@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test OpenSearch k-NN warmup, stats and memory estimates.
+
+This script runs OpenSearchManager against a local stand-in client that
+replays a recorded ``_plugins/_knn/stats`` response, so no cluster is
+needed.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.opensearch_manager import OpenSearchManager, estimate_vector_memory, summarize_knn_stats
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+INDEX = "bedrock-knowledge-base-index"
+
+
+class StandInTransport:
+    """Replays the recorded k-NN stats response."""
+
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+
+    def perform_request(self, method: str, path: str) -> Dict[str, Any]:
+        self.paths.append(path)
+        return json.loads((FIXTURES / "knn_stats_response.json").read_text())
+
+
+class StandInIndices:
+    """Returns a 512-dim binary vector mapping with m=24."""
+
+    def get(self, index: str) -> Dict[str, Any]:
+        vector = {
+            'type': 'knn_vector',
+            'dimension': 512,
+            'data_type': 'binary',
+            'method': {'engine': 'faiss', 'name': 'hnsw', 'space_type': 'hamming',
+                       'parameters': {'m': 24}}
+        }
+        return {index: {'mappings': {'properties': {'bedrock-knowledge-base-default-vector': vector}}}}
+
+
+class StandInClient:
+    """Local stand-in for the OpenSearch client."""
+
+    def __init__(self) -> None:
+        self.indices = StandInIndices()
+        self.transport = StandInTransport()
+        self.searches: List[Dict[str, Any]] = []
+
+    def count(self, index: str) -> Dict[str, Any]:
+        return {'count': 20000}
+
+    def search(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.searches.append(body)
+        return {'took': 7, 'hits': {'total': {'value': 1}, 'hits': []}}
+
+
+def make_manager(service: str) -> OpenSearchManager:
+    """Create a manager bound to the stand-in client."""
+    return OpenSearchManager(collection_endpoint="http://localhost", client=StandInClient(),
+                             service=service)
+
+
+def test_summarize_knn_stats() -> None:
+    """Test the per-node summary of a recorded stats response."""
+    response = json.loads((FIXTURES / "knn_stats_response.json").read_text())
+    summary = summarize_knn_stats(response)
+
+    assert summary['available'] is True
+    assert summary['cluster_name'] == "123456789012:rag-domain"
+    assert summary['circuit_breaker_triggered'] is False
+
+    loaded = summary['nodes']['hLm8NfT5Q6uXxmVYt1uH9w']
+    assert loaded['graph_memory_usage_kb'] == 2845312
+    assert loaded['hit_count'] == 1372 and loaded['miss_count'] == 48
+    assert loaded['indices'][INDEX] == {'graph_memory_usage_kb': 2845312, 'graph_count': 24}
+
+    # Fields missing from a node's stats fall back to defaults
+    empty = summary['nodes']['Z0c1cWxbRz6Vf1yB8p2o4A']
+    assert empty['cache_capacity_reached'] is True
+    assert empty['eviction_count'] == 7
+    assert empty['indices'] == {}
+
+
+def test_estimate_index_memory() -> None:
+    """Test that the estimate reads dimension, data type and m from the mapping."""
+    estimate = make_manager('aoss').estimate_index_memory(INDEX)
+
+    assert (estimate['dimension'], estimate['data_type'], estimate['m']) == (512, 'binary', 24)
+    assert estimate['num_vectors'] == 20000
+    assert estimate['estimated_bytes'] == estimate_vector_memory(20000, 512, 'binary', 24)
+
+
+def test_domain_uses_knn_plugin_apis() -> None:
+    """Test that a managed domain calls the warmup and stats plugin APIs."""
+    manager = make_manager('es')
+    manager.warmup_index(INDEX)
+    stats = manager.get_knn_stats()
+
+    assert manager.client.transport.paths == [f'/_plugins/_knn/warmup/{INDEX}', '/_plugins/_knn/stats']
+    assert stats['available'] is True
+
+
+def test_serverless_warmup_runs_queries() -> None:
+    """Test that Serverless warmup issues k-NN queries and stats are unavailable."""
+    manager = make_manager('aoss')
+    result = manager.warmup_index(INDEX, num_queries=3)
+
+    assert result['took_ms'] == [7, 7, 7]
+    assert manager.client.transport.paths == []
+    query = manager.client.searches[0]['query']['knn']['bedrock-knowledge-base-default-vector']
+    assert len(query['vector']) == 512 // 8
+    assert manager.get_knn_stats()['available'] is False
+
+
+def main() -> None:
+    """Run OpenSearch manager tests."""
+    print("=" * 70)
+    print("Testing k-NN Warmup, Stats and Memory Estimates")
+    print("=" * 70)
+    print()
+
+    try:
+        test_summarize_knn_stats()
+        test_estimate_index_memory()
+        test_domain_uses_knn_plugin_apis()
+        test_serverless_warmup_runs_queries()
+
+        print("✅ All tests completed successfully!")
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test near-duplicate detection used by corpus preprocessing.
+
+This script checks that MinHash + LSH flags near-identical documents
+and keeps distinct ones, without touching AWS.
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.preprocess_corpus import (
+    LSHIndex, MinHasher, _init_worker, _process_document, bounded_map,
+    directory_prefix, estimate_chunks, normalize_text, shingles
+)
+
+
+BASE_TEXT = " ".join(f"token{i % 97} word{i}" for i in range(400))
+
+
+def test_near_duplicate_detected() -> None:
+    """Test that a lightly edited, reformatted copy is found as duplicate."""
+    hasher = MinHasher()
+    index = LSHIndex()
+
+    original = normalize_text(BASE_TEXT)
+    copy = normalize_text(BASE_TEXT.upper().replace("word10 ", "edited ").replace(" ", "\n  "))
+
+    index.insert("original", hasher.signature(shingles(original)))
+    match = index.query(hasher.signature(shingles(copy)), threshold=0.8)
+
+    assert match is not None
+    assert match[0] == "original"
+
+
+def test_distinct_document_kept() -> None:
+    """Test that an unrelated document is not matched."""
+    hasher = MinHasher()
+    index = LSHIndex()
+
+    other = normalize_text(" ".join(f"other{i}" for i in range(400)))
+
+    index.insert("original", hasher.signature(shingles(normalize_text(BASE_TEXT))))
+    assert index.query(hasher.signature(shingles(other)), threshold=0.8) is None
+
+
+def test_estimate_chunks() -> None:
+    """Test hierarchical chunk estimate (1500 parent / 300 child / 60 overlap)."""
+    assert estimate_chunks(0) == 0
+    assert estimate_chunks(1500) == 1 + 6
+
+
+def test_bounded_map_keeps_submission_order() -> None:
+    """Test that results do not come back in completion order."""
+    def slow_first(delay: float) -> float:
+        time.sleep(delay)
+        return delay
+
+    delays = [0.2, 0.0, 0.1, 0.0, 0.05]
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        assert list(bounded_map(executor, slow_first, delays, max_in_flight=3)) == delays
+
+
+def test_unreadable_document_recorded() -> None:
+    """Test that a failing document yields an error record instead of raising."""
+    _init_worker(None, None, None, 128, 5)
+    record = _process_document("/nonexistent/corpus/missing.txt")
+
+    assert record['key'] == "/nonexistent/corpus/missing.txt"
+    assert 'FileNotFoundError' in record['error']
+
+
+def test_directory_prefix() -> None:
+    """Test that S3 prefixes are treated as directories."""
+    assert directory_prefix("") == ""
+    assert directory_prefix("raw") == "raw/"
+    assert directory_prefix("raw/") == "raw/"
+
+
+def main() -> None:
+    """Run preprocessing tests."""
+    print("=" * 70)
+    print("Testing Near-Duplicate Detection")
+    print("=" * 70)
+    print()
+
+    try:
+        test_near_duplicate_detected()
+        test_distinct_document_kept()
+        test_estimate_chunks()
+        test_bounded_map_keeps_submission_order()
+        test_unreadable_document_recorded()
+        test_directory_prefix()
+
+        print("✅ All tests completed successfully!")
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test vector query profiling.
+
+This script runs OpenSearchManager profiling against a local stand-in
+client that replays a recorded ``profile: true`` response, so no cluster
+is needed.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.opensearch_manager import OpenSearchManager
+from scripts.query_profiler import format_profile_report, query_shape
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class StandInIndices:
+    """Returns growing search counters on each stats call."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def stats(self, index: str, metric: str) -> Dict[str, Any]:
+        self.calls += 1
+        search = {
+            'query_total': 100 * self.calls,
+            'query_time_in_millis': 2500 * self.calls,
+            'fetch_total': 100 * self.calls,
+            'fetch_time_in_millis': 300 * self.calls
+        }
+        return {'indices': {index: {'total': {'search': search}}}}
+
+
+class StandInClient:
+    """Local stand-in for the OpenSearch client."""
+
+    def __init__(self) -> None:
+        self.indices = StandInIndices()
+        self.requests: List[Dict[str, Any]] = []
+        self.recorded = json.loads((FIXTURES / "knn_profile_response.json").read_text())
+
+    def search(self, index: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests.append(body)
+        if body.get('profile'):
+            return self.recorded
+        # Hybrid queries (with a text clause) are slower in this stand-in
+        took = 40 if 'bool' in body.get('query', {}) else 10
+        return {'took': took, 'hits': {'total': {'value': 5}, 'hits': []}}
+
+
+def make_manager() -> OpenSearchManager:
+    """Create a manager bound to the stand-in client."""
+    return OpenSearchManager(collection_endpoint="http://localhost", client=StandInClient())
+
+
+def knn_body(vector: List[float], text: str = "", k: int = 5) -> Dict[str, Any]:
+    """Build a k-NN query, optionally combined with a text match."""
+    knn = {'knn': {'bedrock-knowledge-base-default-vector': {'vector': vector, 'k': k}}}
+    if not text:
+        return {'size': 5, 'query': knn}
+    return {'size': 5, 'query': {'bool': {'must': [knn, {'match': {'AMAZON_BEDROCK_TEXT_CHUNK': text}}]}}}
+
+
+def test_profile_report() -> None:
+    """Test that shard and phase timings are parsed from a recorded response."""
+    manager = make_manager()
+    report = manager.profile_query(knn_body([0.1, 0.2, 0.3]))
+
+    assert manager.client.requests[0]['profile'] is True
+    assert report['took_ms'] == 48
+    assert report['hits'] == 5
+
+    slowest = report['shards'][0]
+    assert slowest['id'].endswith("[0]")
+    assert slowest['query_ms'] == 31.25
+    assert list(slowest['breakdown_ms'])[0] == 'create_weight'
+    assert 'create_weight_count' not in slowest['breakdown_ms']
+
+    hybrid = report['shards'][1]
+    assert [node['depth'] for node in hybrid['query_tree']] == [0, 1, 1]
+    assert "KNNQuery" in format_profile_report(report)
+
+
+def test_replay_ranks_slowest_shape() -> None:
+    """Test that replayed queries are grouped by shape and ranked."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "query_log.jsonl"
+        with open(log, 'w', encoding='utf-8') as f:
+            for i in range(3):
+                f.write(json.dumps(knn_body([0.1 * i, 0.2])) + "\n")
+                f.write(json.dumps({'body': knn_body([0.3, 0.1 * i], text=f"question {i}")}) + "\n")
+
+        ranking = make_manager().replay_query_log(str(log))
+
+    assert len(ranking) == 2
+    assert ranking[0]['shape'] == query_shape(knn_body([0.0, 0.0], text="x"))
+    assert ranking[0]['p95_ms'] == 40
+    assert ranking[0]['count'] == 3
+
+
+def test_query_shape_keeps_structural_parameters() -> None:
+    """Test that k and size stay literal while vectors and text are stripped."""
+    assert query_shape(knn_body([0.1, 0.2], k=5)) == query_shape(knn_body([0.9, 0.8], k=5))
+    assert query_shape(knn_body([0.1, 0.2], k=5)) != query_shape(knn_body([0.1, 0.2], k=50))
+    assert query_shape(knn_body([0.1], text="a")) == query_shape(knn_body([0.2], text="b"))
+
+    shape = json.loads(query_shape(dict(knn_body([0.1, 0.2], k=10), size=20, **{'from': 40})))
+    assert shape['size'] == 20 and shape['from'] == 40
+    assert shape['query']['knn']['bedrock-knowledge-base-default-vector'] == {'k': 10, 'vector': '<vector[2]>'}
+
+
+def test_search_stats_window() -> None:
+    """Test index search stats over a window."""
+    stats = make_manager().get_search_stats(window_seconds=10, sleep=lambda seconds: None)
+
+    assert stats['queries'] == 100
+    assert stats['queries_per_second'] == 10.0
+    assert stats['avg_query_ms'] == 25.0
+    assert stats['avg_fetch_ms'] == 3.0
+
+
+def main() -> None:
+    """Run query profiling tests."""
+    print("=" * 70)
+    print("Testing Vector Query Profiling")
+    print("=" * 70)
+    print()
+
+    try:
+        test_profile_report()
+        test_replay_ranks_slowest_shape()
+        test_query_shape_keeps_structural_parameters()
+        test_search_stats_window()
+
+        print("✅ All tests completed successfully!")
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()